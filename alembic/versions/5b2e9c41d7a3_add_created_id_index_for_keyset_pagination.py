@@ -0,0 +1,24 @@
+"""Add (created_at, id) index for keyset pagination
+
+Revision ID: 5b2e9c41d7a3
+Revises: 837db9457925
+Create Date: 2026-10-14 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2e9c41d7a3'
+down_revision = '837db9457925'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_todos_created_id', 'todos', [sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_todos_created_id', table_name='todos')
@@ -0,0 +1,24 @@
+"""Add partial end_date index for incomplete todos
+
+Revision ID: 9c4f1a2e6b8d
+Revises: 5b2e9c41d7a3
+Create Date: 2026-10-14 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4f1a2e6b8d'
+down_revision = '5b2e9c41d7a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_todos_incomplete_overdue', 'todos', ['end_date'], unique=False, postgresql_where=sa.text('completed IS false'))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_todos_incomplete_overdue', table_name='todos', postgresql_where=sa.text('completed IS false'))
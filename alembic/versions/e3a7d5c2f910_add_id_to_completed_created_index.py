@@ -0,0 +1,26 @@
+"""Add id tiebreaker to (completed, created_at) index
+
+Revision ID: e3a7d5c2f910
+Revises: 9c4f1a2e6b8d
+Create Date: 2026-10-14 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a7d5c2f910'
+down_revision = '9c4f1a2e6b8d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('idx_todos_completed_created', table_name='todos')
+    op.create_index('idx_todos_completed_created', 'todos', ['completed', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_todos_completed_created', table_name='todos')
+    op.create_index('idx_todos_completed_created', 'todos', ['completed', sa.text('created_at DESC')], unique=False)
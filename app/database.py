@@ -14,10 +14,37 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# コンパイル済みSQLキャッシュのサイズ（SQLAlchemyのデフォルトは500）
+QUERY_CACHE_SIZE = 1200
+
+
+def _postgres_connect_args() -> dict:
+    """
+    PostgreSQL接続時に渡すconnect_argsを組み立てる
+
+    小さなクエリではJITのコンパイルコストが実行時間を上回るため、
+    既定ではセッション単位でJITを無効化する。
+
+    Returns:
+        dict: psycopg2に渡す接続引数
+    """
+    options = []
+    if not settings.database_jit:
+        options.append("-c jit=off")
+    if settings.database_work_mem:
+        options.append(f"-c work_mem={settings.database_work_mem}")
+
+    connect_args = {"application_name": settings.app_name}
+    if options:
+        connect_args["options"] = " ".join(options)
+    return connect_args
+
+
 # SQLAlchemyエンジンの作成
 def create_database_engine():
     """データベースエンジンを作成する"""
     database_url = settings.get_database_url()
+    echo = settings.debug
     
     if database_url.startswith("sqlite"):
         # SQLite用の設定
@@ -25,26 +52,32 @@ def create_database_engine():
             database_url,
             poolclass=StaticPool,
             connect_args={"check_same_thread": False},
-            echo=settings.debug
+            query_cache_size=QUERY_CACHE_SIZE,
+            echo=echo
         )
     else:
         # PostgreSQL用の設定
         return create_engine(
             database_url,
-            pool_pre_ping=True,
+            pool_pre_ping=settings.database_pool_pre_ping,
+            pool_use_lifo=settings.database_pool_use_lifo,
             pool_size=settings.database_pool_size,
             max_overflow=settings.database_max_overflow,
             pool_timeout=settings.database_pool_timeout,
             pool_recycle=settings.database_pool_recycle,
-            echo=settings.debug
+            query_cache_size=QUERY_CACHE_SIZE,
+            connect_args=_postgres_connect_args(),
+            echo=echo
         )
 
 engine = create_database_engine()
 
 # セッションファクトリーの作成
+# コミット後に属性を失効させない（RETURNINGで取得した値をそのままレスポンスに使う）
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine
 )
 
@@ -66,7 +99,7 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     except Exception as e:
-        logger.error(f"Database session error: {e}")
+        logger.error("Database session error: %s", e)
         db.rollback()
         raise
     finally:
@@ -85,7 +118,7 @@ def create_tables():
         logger.info("Database tables created successfully")
         logger.warning("create_tables() is deprecated. Use Alembic migrations instead.")
     except Exception as e:
-        logger.error(f"Failed to create database tables: {e}")
+        logger.error("Failed to create database tables: %s", e)
         raise
 
 
@@ -5,17 +5,22 @@ FastAPIアプリケーション用のカスタム例外ハンドラーを定義
 404、422、500エラーの適切な処理を実装する。
 """
 from fastapi import Request, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
+import json
 import logging
 
 from app.services.todo import TodoNotFoundError, TodoValidationError, TodoDatabaseError
 
 logger = logging.getLogger(__name__)
 
+# バリデーションエラー時にレスポンスへ含めるリクエストボディの最大バイト数
+MAX_ECHO_BODY_BYTES = 2048
 
-async def todo_not_found_handler(request: Request, exc: TodoNotFoundError) -> JSONResponse:
+
+async def todo_not_found_handler(request: Request, exc: TodoNotFoundError) -> ORJSONResponse:
     """
     ToDoアイテムが見つからない場合の例外ハンドラー
     
@@ -24,10 +29,10 @@ async def todo_not_found_handler(request: Request, exc: TodoNotFoundError) -> JS
         exc (TodoNotFoundError): ToDoアイテムが見つからない例外
         
     Returns:
-        JSONResponse: 404エラーレスポンス
+        ORJSONResponse: 404エラーレスポンス
     """
-    logger.warning(f"Todo not found: {exc}")
-    return JSONResponse(
+    logger.warning("Todo not found: %s", exc)
+    return ORJSONResponse(
         status_code=status.HTTP_404_NOT_FOUND,
         content={
             "detail": str(exc),
@@ -37,7 +42,7 @@ async def todo_not_found_handler(request: Request, exc: TodoNotFoundError) -> JS
     )
 
 
-async def todo_validation_error_handler(request: Request, exc: TodoValidationError) -> JSONResponse:
+async def todo_validation_error_handler(request: Request, exc: TodoValidationError) -> ORJSONResponse:
     """
     ToDoアイテムのバリデーションエラーの例外ハンドラー
     
@@ -46,10 +51,10 @@ async def todo_validation_error_handler(request: Request, exc: TodoValidationErr
         exc (TodoValidationError): バリデーションエラー例外
         
     Returns:
-        JSONResponse: 422エラーレスポンス
+        ORJSONResponse: 422エラーレスポンス
     """
-    logger.warning(f"Todo validation error: {exc}")
-    return JSONResponse(
+    logger.warning("Todo validation error: %s", exc)
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "detail": str(exc),
@@ -58,7 +63,7 @@ async def todo_validation_error_handler(request: Request, exc: TodoValidationErr
     )
 
 
-async def todo_database_error_handler(request: Request, exc: TodoDatabaseError) -> JSONResponse:
+async def todo_database_error_handler(request: Request, exc: TodoDatabaseError) -> ORJSONResponse:
     """
     ToDoアイテムのデータベースエラーの例外ハンドラー
     
@@ -67,10 +72,10 @@ async def todo_database_error_handler(request: Request, exc: TodoDatabaseError)
         exc (TodoDatabaseError): データベースエラー例外
         
     Returns:
-        JSONResponse: 500エラーレスポンス
+        ORJSONResponse: 500エラーレスポンス
     """
-    logger.error(f"Todo database error: {exc}")
-    return JSONResponse(
+    logger.error("Todo database error: %s", exc)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Internal server error occurred",
@@ -80,29 +85,89 @@ async def todo_database_error_handler(request: Request, exc: TodoDatabaseError)
     )
 
 
+def _truncate_for_echo(value):
+    """
+    レスポンスへ含める値を先頭MAX_ECHO_BODY_BYTESバイトまでに制限する
+    
+    bytes・strは切り詰めた文字列にする。dict・list（パース済みのJSONボディなど）は
+    JSONにシリアライズして上限を超える場合のみ、切り詰めたJSON文字列に置き換える。
+    
+    Args:
+        value: 変換する値（上記以外の型はそのまま返す）
+        
+    Returns:
+        変換後の値
+    """
+    if isinstance(value, (dict, list)):
+        encoded = json.dumps(
+            value, ensure_ascii=False, separators=(",", ":"), default=str
+        ).encode('utf-8', errors='ignore')
+        if len(encoded) <= MAX_ECHO_BODY_BYTES:
+            return value
+        value = encoded
+    if isinstance(value, str):
+        # UTF-8では1文字最大4バイトのため、この文字数以下なら上限を超えない（エンコードを省略する）
+        if len(value) <= MAX_ECHO_BODY_BYTES // 4:
+            return value
+        encoded = value.encode('utf-8', errors='ignore')
+        if len(encoded) <= MAX_ECHO_BODY_BYTES:
+            return value
+        value = encoded
+    if isinstance(value, bytes):
+        if len(value) > MAX_ECHO_BODY_BYTES:
+            # 切り詰めによりマルチバイト文字が途中で切れる場合があるため不完全な末尾は捨てる
+            return value[:MAX_ECHO_BODY_BYTES].decode('utf-8', errors='ignore')
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            return str(value)
+    return value
+
+
 def _serialize_validation_errors(errors):
     """
     バリデーションエラーをJSON serializable形式に変換する
     
+    bytesの値は文字列に変換し、巨大な値（文字列・dict・listのinputなど）は
+    先頭MAX_ECHO_BODY_BYTESバイトまでに切り詰める。
+    
     Args:
         errors: バリデーションエラーのリスト
         
     Returns:
         list: JSON serializable形式のエラーリスト
     """
-    serialized_errors = []
-    for error in errors:
-        serialized_error = {}
-        for key, value in error.items():
-            if isinstance(value, bytes):
-                try:
-                    serialized_error[key] = value.decode('utf-8')
-                except UnicodeDecodeError:
-                    serialized_error[key] = str(value)
-            else:
-                serialized_error[key] = value
-        serialized_errors.append(serialized_error)
-    return serialized_errors
+    # bytesや長い文字列、dict・listのinputを含まない場合は変換不要のため、元のリストをそのまま返す
+    if not any(
+        isinstance(v, bytes) or (isinstance(v, str) and len(v) > MAX_ECHO_BODY_BYTES // 4)
+        for e in errors for v in e.values()
+    ) and not any(isinstance(e.get("input"), (dict, list)) for e in errors):
+        return errors
+
+    return [
+        {key: _truncate_for_echo(value) for key, value in error.items()}
+        for error in errors
+    ]
+
+
+def _echo_json_response(status_code: int, content: dict) -> JSONResponse:
+    """
+    クライアントの入力をそのまま含む内容をJSONレスポンスにする
+    
+    orjsonは64ビットを超える整数などをシリアライズできずTypeErrorを送出するため、
+    その場合は標準のjsonで生成する（クライアントエラーが500にならないようにする）。
+    
+    Args:
+        status_code (int): ステータスコード
+        content (dict): レスポンスの内容
+        
+    Returns:
+        JSONResponse: JSONレスポンス
+    """
+    try:
+        return ORJSONResponse(status_code=status_code, content=content)
+    except TypeError:
+        return JSONResponse(status_code=status_code, content=jsonable_encoder(content))
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
@@ -116,20 +181,17 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     Returns:
         JSONResponse: 422エラーレスポンス
     """
-    logger.warning(f"Request validation error: {exc}")
+    logger.warning("Request validation error: %s", exc)
     
     # リクエストボディがbytesの場合は文字列に変換
-    body = exc.body
-    if isinstance(body, bytes):
-        try:
-            body = body.decode('utf-8')
-        except UnicodeDecodeError:
-            body = str(body)
+    # 巨大なボディ（不正なJSONの場合は文字列、正しいJSONの場合はパース済みの値で渡される）を
+    # そのまま返さないよう、先頭MAX_ECHO_BODY_BYTESバイトのみ echo する
+    body = _truncate_for_echo(exc.body)
     
     # エラー詳細をJSON serializable形式に変換
     serialized_errors = _serialize_validation_errors(exc.errors())
     
-    return JSONResponse(
+    return _echo_json_response(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "detail": serialized_errors,
@@ -139,7 +201,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
-async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
+async def http_exception_handler(request: Request, exc: HTTPException) -> ORJSONResponse:
     """
     HTTPExceptionの例外ハンドラー
     
@@ -148,10 +210,10 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
         exc (HTTPException): HTTP例外
         
     Returns:
-        JSONResponse: HTTPエラーレスポンス
+        ORJSONResponse: HTTPエラーレスポンス
     """
-    logger.warning(f"HTTP exception: {exc.status_code} - {exc.detail}")
-    return JSONResponse(
+    logger.warning("HTTP exception: %s - %s", exc.status_code, exc.detail)
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
@@ -161,7 +223,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     )
 
 
-async def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError) -> JSONResponse:
+async def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError) -> ORJSONResponse:
     """
     SQLAlchemyエラーの例外ハンドラー
     
@@ -170,10 +232,10 @@ async def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError) -> JS
         exc (SQLAlchemyError): SQLAlchemyエラー
         
     Returns:
-        JSONResponse: 500エラーレスポンス
+        ORJSONResponse: 500エラーレスポンス
     """
-    logger.error(f"SQLAlchemy error: {exc}")
-    return JSONResponse(
+    logger.error("SQLAlchemy error: %s", exc)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Database operation failed",
@@ -182,7 +244,7 @@ async def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError) -> JS
     )
 
 
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """
     一般的な例外の例外ハンドラー
     
@@ -191,10 +253,10 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
         exc (Exception): 一般的な例外
         
     Returns:
-        JSONResponse: 500エラーレスポンス
+        ORJSONResponse: 500エラーレスポンス
     """
-    logger.error(f"Unexpected error: {exc}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unexpected error: %s", exc, exc_info=True)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "An unexpected error occurred",
@@ -6,10 +6,13 @@ ToDoアプリケーションのバックエンドAPIのエントリーポイン
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
 
-from app.config import settings
+import anyio.to_thread
+
+from app.config import settings, DEBUG
 from app.database import create_tables
 from app.routers import todo, health
 from app.exceptions import register_exception_handlers
@@ -30,17 +33,26 @@ async def lifespan(app: FastAPI):
     """
     アプリケーションのライフサイクル管理
     
-    起動時にデータベーステーブルを作成し、
+    開発環境（DEBUG有効時）のみ起動時にデータベーステーブルを作成し、
     終了時にクリーンアップを行う。
+    本番環境ではAlembicマイグレーション（alembic upgrade head）でスキーマを管理する。
     """
     # 起動時の処理
     logger.info("Starting Todo API Backend application")
-    try:
-        create_tables()
-        logger.info("Database tables initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
-        raise
+    
+    # 同期ハンドラーはスレッドプールで実行されるため、同時実行数をDB接続プールの上限に合わせる
+    # （接続数を超えるスレッドはプール待ちになるだけなので、これ以上増やしても効果はない）
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = settings.database_pool_size + settings.database_max_overflow
+    logger.info("Threadpool size set to %d", limiter.total_tokens)
+    
+    if DEBUG:
+        try:
+            create_tables()
+            logger.info("Database tables initialized successfully")
+        except Exception as e:
+            logger.error("Failed to initialize database: %s", e)
+            raise
     
     yield
     
@@ -56,17 +68,20 @@ app = FastAPI(
     docs_url=settings.docs_url,
     redoc_url=settings.redoc_url,
     openapi_url=settings.openapi_url,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# CORS設定
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=settings.cors_allow_credentials,
-    allow_methods=settings.cors_allow_methods,
-    allow_headers=settings.cors_allow_headers,
-)
+# CORS設定（無効化されている場合やオリジンが未指定の場合はミドルウェアを登録しない）
+if settings.enable_cors and settings.cors_origins and settings.cors_origins != ["disabled"]:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=settings.cors_allow_credentials,
+        allow_methods=settings.cors_allow_methods,
+        allow_headers=settings.cors_allow_headers,
+        expose_headers=["X-Total-Count", "X-Next-Cursor", "ETag"],
+    )
 
 # 例外ハンドラーの登録
 register_exception_handlers(app)
@@ -95,7 +110,7 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
     
-    logger.info(f"Starting server on http://{settings.host}:{settings.port}")
+    logger.info("Starting server on http://%s:%s", settings.host, settings.port)
     uvicorn.run(
         "app.main:app",
         host=settings.host,
@@ -3,9 +3,10 @@ ToDoアイテムのSQLAlchemyモデル
 
 PostgreSQLデータベースのtodosテーブルに対応するモデルを定義する。
 """
+from datetime import datetime, timezone
+
 from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import validates
 
 from app.database import Base
 
@@ -29,6 +30,9 @@ class Todo(Base):
     """
     __tablename__ = "todos"
 
+    # リレーションシップを追加する場合は relationship(..., lazy="raise_on_sql") を指定し、
+    # 一覧取得時の暗黙の遅延ロード（N+1クエリ）をエラーとして検出できるようにする
+
     id = Column(Integer, primary_key=True, index=True, comment="主キー")
     title = Column(
         String(TITLE_MAX_LENGTH),
@@ -114,40 +118,12 @@ class Todo(Base):
         Returns:
             bool: 期限切れの場合True
         """
-        from datetime import datetime, timezone
-        
         if not self.end_date or self.completed:
             return False
         
         now = datetime.now(timezone.utc)
         return self.end_date < now
 
-    @validates('title')
-    def validate_title(self, key, title):
-        """タイトルの妥当性を検証する"""
-        if not title or not title.strip():
-            raise ValueError("Title cannot be empty or just whitespace")
-        
-        if len(title) > TITLE_MAX_LENGTH:
-            raise ValueError(
-                f"Title cannot exceed {TITLE_MAX_LENGTH} characters"
-            )
-        
-        return title.strip()
-
-    @validates('description')
-    def validate_description(self, key, description):
-        """説明の妥当性を検証する"""
-        if description is not None:
-            if len(description) > DESCRIPTION_MAX_LENGTH:
-                raise ValueError(
-                    f"Description cannot exceed {DESCRIPTION_MAX_LENGTH} "
-                    "characters"
-                )
-            description = description.strip()
-            return description if description else None
-        return description
-
 
 # インデックスの定義
 # パフォーマンス向上のため、よく検索される列にインデックスを作成
@@ -159,9 +135,12 @@ Index("idx_todos_end_date", Todo.end_date)
 
 # 複合インデックス：よくある検索パターンを最適化
 # 完了状態と作成日時での検索（リスト表示用）
-Index("idx_todos_completed_created", Todo.completed, Todo.created_at.desc())
+# 並び順のタイブレーカーであるidまで含め、ORDER BY ... LIMITをソートなしのインデックス走査で返す
+Index("idx_todos_completed_created", Todo.completed, Todo.created_at.desc(), Todo.id.desc())
 # 期限切れタスクの検索用
 Index("idx_todos_incomplete_end_date", Todo.completed, Todo.end_date)
+# カーソル（キーセット）ページネーション用：(created_at, id) の降順
+Index("idx_todos_created_id", Todo.created_at.desc(), Todo.id.desc())
 
 # 部分インデックス：PostgreSQL特有の最適化
 # 未完了タスクのみのインデックス（完了済みタスクは除外）
@@ -169,4 +148,10 @@ Index(
     "idx_todos_incomplete_only",
     Todo.created_at.desc(),
     postgresql_where=(Todo.completed.is_(False))
+)
+# 未完了タスクの期限範囲検索（期限切れタスクの抽出）用
+Index(
+    "idx_todos_incomplete_overdue",
+    Todo.end_date,
+    postgresql_where=(Todo.completed.is_(False))
 )
\ No newline at end of file
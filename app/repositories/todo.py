@@ -4,18 +4,35 @@ ToDoリポジトリ
 ToDoアイテムのデータアクセス層を実装する。
 CRUD操作とデータベースセッション管理を提供する。
 """
-from typing import List, Optional
+from typing import Iterator, Optional, Sequence, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_
+from sqlalchemy import Row, case, select, func, insert, update, delete, tuple_, text, lambda_stmt
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 import logging
 
+from app.config import DEFAULT_PAGE_SIZE
 from app.models.todo import Todo
-from app.schemas.todo import TodoCreate, TodoUpdate, TodoSearchParams
+from app.schemas.todo import TodoCreate, TodoUpdate, TodoSearchParams, decode_cursor
 
 logger = logging.getLogger(__name__)
 
+# ストリーミング取得時に1回でフェッチする件数
+STREAM_BATCH_SIZE = 500
+
+# 一覧取得で読み込む列（TodoResponseに必要な列のみ）
+# ORMエンティティではなく列単位で取得し、アイデンティティマップ登録と属性計装のコストを省く
+LIST_COLUMNS = (
+    Todo.id,
+    Todo.title,
+    Todo.description,
+    Todo.completed,
+    Todo.end_date,
+    Todo.created_at,
+    Todo.updated_at,
+)
+
 
 class TodoRepository:
     """
@@ -34,7 +51,7 @@ class TodoRepository:
         """
         self.db = db
     
-    def create(self, todo_data: TodoCreate) -> Todo:
+    def create(self, todo_data: TodoCreate) -> Row:
         """
         新しいToDoアイテムを作成する
         
@@ -42,27 +59,24 @@ class TodoRepository:
             todo_data (TodoCreate): 作成するToDoアイテムのデータ
             
         Returns:
-            Todo: 作成されたToDoアイテム
+            Row: 作成されたToDoアイテムの行
             
         Raises:
             SQLAlchemyError: データベース操作エラー
         """
         try:
-            db_todo = Todo(
-                title=todo_data.title,
-                description=todo_data.description,
-                completed=todo_data.completed,
-                end_date=todo_data.end_date
-            )
-            self.db.add(db_todo)
+            # INSERT ... RETURNING で採番値・サーバー側デフォルト値を1回のSQLで取得する
+            # エンティティではなく列単位で受け取り、アイデンティティマップへの登録と
+            # コミット後の属性失効によるSELECTを避ける
+            stmt = insert(Todo).values(**todo_data.model_dump()).returning(*LIST_COLUMNS)
+            db_todo = self.db.execute(stmt).one()
             self.db.commit()
-            self.db.refresh(db_todo)
             
-            logger.info(f"Created todo item with id: {db_todo.id}")
+            logger.info("Created todo item with id: %s", db_todo.id)
             return db_todo
             
         except SQLAlchemyError as e:
-            logger.error(f"Failed to create todo item: {e}")
+            logger.error("Failed to create todo item: %s", e)
             self.db.rollback()
             raise
     
@@ -77,18 +91,18 @@ class TodoRepository:
             Optional[Todo]: 見つかったToDoアイテム、存在しない場合はNone
         """
         try:
-            todo = self.db.query(Todo).filter(Todo.id == todo_id).first()
+            todo = self.db.get(Todo, todo_id)
             if todo:
-                logger.debug(f"Retrieved todo item with id: {todo_id}")
+                logger.debug("Retrieved todo item with id: %s", todo_id)
             else:
-                logger.debug(f"Todo item with id {todo_id} not found")
+                logger.debug("Todo item with id %s not found", todo_id)
             return todo
             
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get todo item by id {todo_id}: {e}")
+            logger.error("Failed to get todo item by id %s: %s", todo_id, e)
             raise
     
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Todo]:
+    def get_all(self, skip: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Sequence[Row]:
         """
         すべてのToDoアイテムを取得する
         
@@ -97,21 +111,58 @@ class TodoRepository:
             limit (int): 取得する最大件数
             
         Returns:
-            List[Todo]: ToDoアイテムのリスト
+            Sequence[Row]: ToDoアイテムの行（LIST_COLUMNSの各列を属性として持つ）のリスト
         """
         try:
-            todos = (
-                self.db.query(Todo)
-                .order_by(Todo.created_at.desc())
+            stmt = (
+                select(*LIST_COLUMNS)
+                .order_by(Todo.created_at.desc(), Todo.id.desc())
                 .offset(skip)
                 .limit(limit)
-                .all()
             )
-            logger.debug(f"Retrieved {len(todos)} todo items")
+            todos = self.db.execute(stmt).all()
+            logger.debug("Retrieved %d todo items", len(todos))
             return todos
             
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get all todo items: {e}")
+            logger.error("Failed to get all todo items: %s", e)
+            raise
+    
+    def get_page(self, skip: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[Sequence[Row], int]:
+        """
+        ToDoアイテムの1ページ分と総件数を取得する
+        
+        ウィンドウ関数（COUNT(*) OVER ()）で総件数を同じSELECTに含め、
+        一覧取得と件数取得を1回のクエリで行う。
+        
+        Args:
+            skip (int): スキップする件数（ページネーション用）
+            limit (int): 取得する最大件数
+            
+        Returns:
+            Tuple[Sequence[Row], int]: ToDoアイテムの行のリストと総件数
+        """
+        try:
+            stmt = (
+                select(*LIST_COLUMNS, func.count().over().label("total"))
+                .order_by(Todo.created_at.desc(), Todo.id.desc())
+                .offset(skip)
+                .limit(limit)
+            )
+            rows = self.db.execute(stmt).all()
+            if rows:
+                total = rows[0].total
+            elif skip > 0:
+                # 範囲外のページでは行が返らないため、総件数のみ別途取得する
+                total = self.count_all()
+            else:
+                total = 0
+            
+            logger.debug("Retrieved %d todo items (total: %s)", len(rows), total)
+            return rows, total
+            
+        except SQLAlchemyError as e:
+            logger.error("Failed to get todo page: %s", e)
             raise
     
     def update(self, todo_id: int, todo_data: TodoUpdate) -> Optional[Todo]:
@@ -129,24 +180,40 @@ class TodoRepository:
             SQLAlchemyError: データベース操作エラー
         """
         try:
-            db_todo = self.db.query(Todo).filter(Todo.id == todo_id).first()
+            # 更新データが提供された場合のみ更新
+            # （フラットな検証済みモデルのため、model_dumpを経由せず設定済みフィールドを直接参照する）
+            update_data = {
+                field: getattr(todo_data, field)
+                for field in todo_data.model_fields_set
+            }
+            if not update_data:
+                return self.get_by_id(todo_id)
+            
+            # UPDATE ... RETURNING で更新と再取得を1回のSQLで行う
+            # （行が既にセッションに読み込まれている場合も古い属性を返さないよう、
+            #   populate_existingでRETURNINGの値を既存オブジェクトに反映する）
+            stmt = (
+                update(Todo)
+                .where(Todo.id == todo_id)
+                .values(**update_data)
+                .returning(Todo)
+            )
+            db_todo = self.db.execute(
+                stmt,
+                execution_options={"synchronize_session": False, "populate_existing": True}
+            ).scalar_one_or_none()
             if not db_todo:
-                logger.debug(f"Todo item with id {todo_id} not found for update")
+                self.db.rollback()
+                logger.debug("Todo item with id %s not found for update", todo_id)
                 return None
             
-            # 更新データが提供された場合のみ更新
-            update_data = todo_data.model_dump(exclude_unset=True)
-            for field, value in update_data.items():
-                setattr(db_todo, field, value)
-            
             self.db.commit()
-            self.db.refresh(db_todo)
             
-            logger.info(f"Updated todo item with id: {todo_id}")
+            logger.info("Updated todo item with id: %s", todo_id)
             return db_todo
             
         except SQLAlchemyError as e:
-            logger.error(f"Failed to update todo item with id {todo_id}: {e}")
+            logger.error("Failed to update todo item with id %s: %s", todo_id, e)
             self.db.rollback()
             raise
     
@@ -164,46 +231,89 @@ class TodoRepository:
             SQLAlchemyError: データベース操作エラー
         """
         try:
-            db_todo = self.db.query(Todo).filter(Todo.id == todo_id).first()
-            if not db_todo:
-                logger.debug(f"Todo item with id {todo_id} not found for deletion")
+            result = self.db.execute(delete(Todo).where(Todo.id == todo_id))
+            if result.rowcount == 0:
+                self.db.rollback()
+                logger.debug("Todo item with id %s not found for deletion", todo_id)
                 return False
             
-            self.db.delete(db_todo)
             self.db.commit()
             
-            logger.info(f"Deleted todo item with id: {todo_id}")
+            logger.info("Deleted todo item with id: %s", todo_id)
             return True
             
         except SQLAlchemyError as e:
-            logger.error(f"Failed to delete todo item with id {todo_id}: {e}")
+            logger.error("Failed to delete todo item with id %s: %s", todo_id, e)
             self.db.rollback()
             raise
     
-    def get_by_completion_status(self, completed: bool) -> List[Todo]:
+    def get_by_completion_status(
+        self, completed: bool, skip: int = 0, limit: int = DEFAULT_PAGE_SIZE
+    ) -> Sequence[Row]:
         """
         完了状態でToDoアイテムを取得する
         
         Args:
             completed (bool): 完了状態（True: 完了済み、False: 未完了）
+            skip (int): スキップする件数（デフォルト: 0）
+            limit (int): 取得する最大件数（デフォルト: DEFAULT_PAGE_SIZE）
             
         Returns:
-            List[Todo]: 指定された完了状態のToDoアイテムのリスト
+            Sequence[Row]: 指定された完了状態のToDoアイテムの行のリスト
         """
         try:
-            todos = (
-                self.db.query(Todo)
-                .filter(Todo.completed == completed)
-                .order_by(Todo.created_at.desc())
-                .all()
+            stmt = (
+                self._completion_status_query(completed, *LIST_COLUMNS)
+                .offset(skip)
+                .limit(limit)
             )
-            logger.debug(f"Retrieved {len(todos)} todo items with completed={completed}")
+            todos = self.db.execute(stmt).all()
+            logger.debug("Retrieved %d todo items with completed=%s", len(todos), completed)
             return todos
             
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get todo items by completion status: {e}")
+            logger.error("Failed to get todo items by completion status: %s", e)
+            raise
+    
+    def stream_by_completion_status(
+        self, completed: bool, batch_size: int = STREAM_BATCH_SIZE
+    ) -> Iterator[Todo]:
+        """
+        完了状態でToDoアイテムを逐次取得する（エクスポート用）
+        
+        全件をメモリに載せずにbatch_size件ずつフェッチする。
+        
+        Args:
+            completed (bool): 完了状態（True: 完了済み、False: 未完了）
+            batch_size (int): 1回にフェッチする件数
+            
+        Returns:
+            Iterator[Todo]: 指定された完了状態のToDoアイテムのイテレータ
+        """
+        try:
+            stmt = self._completion_status_query(completed).execution_options(
+                yield_per=batch_size
+            )
+            return self.db.execute(stmt).scalars()
+            
+        except SQLAlchemyError as e:
+            logger.error("Failed to stream todo items by completion status: %s", e)
             raise
     
+    @staticmethod
+    def _completion_status_query(completed: bool, *columns):
+        """完了状態で絞り込み、作成日時の降順に並べるSELECT文を生成する（列未指定時はTodoエンティティ）"""
+        if columns:
+            stmt = select(*columns)
+        else:
+            # エンティティ取得時は遅延ロードを禁止し、将来のリレーションシップ追加によるN+1を検出する
+            stmt = select(Todo).options(raiseload("*"))
+        return (
+            stmt
+            .where(Todo.completed == completed)
+            .order_by(Todo.created_at.desc(), Todo.id.desc())
+        )
+    
     def count_all(self) -> int:
         """
         すべてのToDoアイテムの数を取得する
@@ -212,12 +322,42 @@ class TodoRepository:
             int: ToDoアイテムの総数
         """
         try:
-            count = self.db.query(Todo).count()
-            logger.debug(f"Total todo items count: {count}")
+            count = self.db.execute(
+                select(func.count()).select_from(Todo)
+            ).scalar_one()
+            logger.debug("Total todo items count: %s", count)
             return count
             
         except SQLAlchemyError as e:
-            logger.error(f"Failed to count todo items: {e}")
+            logger.error("Failed to count todo items: %s", e)
+            raise
+    
+    def estimate_count_all(self) -> Optional[int]:
+        """
+        すべてのToDoアイテムの概算件数を取得する
+        
+        PostgreSQLではテーブル統計（pg_class.reltuples）から件数を推定し、
+        COUNT(*)による全件走査を避ける。
+        統計が利用できない場合（PostgreSQL以外、または未ANALYZEのテーブル）はNoneを返す。
+        
+        Returns:
+            Optional[int]: ToDoアイテムの概算件数
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return None
+        
+        try:
+            estimate = self.db.execute(
+                text("SELECT reltuples::BIGINT FROM pg_class WHERE relname = :table_name"),
+                {"table_name": Todo.__tablename__}
+            ).scalar_one_or_none()
+            if estimate is None or estimate < 0:
+                return None
+            logger.debug("Estimated todo items count: %s", estimate)
+            return estimate
+            
+        except SQLAlchemyError as e:
+            logger.error("Failed to estimate todo items count: %s", e)
             raise
     
     def count_by_completion_status(self, completed: bool) -> int:
@@ -231,15 +371,45 @@ class TodoRepository:
             int: 指定された完了状態のToDoアイテム数
         """
         try:
-            count = self.db.query(Todo).filter(Todo.completed == completed).count()
-            logger.debug(f"Todo items count with completed={completed}: {count}")
+            count = self.db.execute(
+                select(func.count())
+                .select_from(Todo)
+                .where(Todo.completed == completed)
+            ).scalar_one()
+            logger.debug("Todo items count with completed=%s: %s", completed, count)
             return count
             
         except SQLAlchemyError as e:
-            logger.error(f"Failed to count todo items by completion status: {e}")
+            logger.error("Failed to count todo items by completion status: %s", e)
+            raise
+    
+    def get_stats(self) -> Tuple[int, int]:
+        """
+        ToDoアイテムの総数と完了済みの数を1回のクエリで取得する
+        
+        条件付き集計（SUM(CASE WHEN ...)）により、総数と完了数を1回の走査で数える。
+        
+        Returns:
+            Tuple[int, int]: 総数と完了済みの数
+            
+        Raises:
+            SQLAlchemyError: データベース操作エラー
+        """
+        try:
+            total, completed = self.db.execute(
+                select(
+                    func.count(Todo.id),
+                    func.coalesce(func.sum(case((Todo.completed.is_(True), 1), else_=0)), 0)
+                )
+            ).one()
+            logger.debug("Todo items stats: total=%s, completed=%s", total, completed)
+            return total, completed
+            
+        except SQLAlchemyError as e:
+            logger.error("Failed to get todo item stats: %s", e)
             raise
     
-    def search_todos(self, search_params: TodoSearchParams) -> List[Todo]:
+    def search_todos(self, search_params: TodoSearchParams) -> Sequence[Row]:
         """
         条件に基づいてToDoアイテムを検索する
         
@@ -247,45 +417,114 @@ class TodoRepository:
             search_params (TodoSearchParams): 検索条件パラメータ
             
         Returns:
-            List[Todo]: 検索条件に一致するToDoアイテムのリスト
+            Sequence[Row]: 検索条件に一致するToDoアイテムの行のリスト
             
         Raises:
             SQLAlchemyError: データベース操作エラー
         """
         try:
-            query = self.db.query(Todo)
-            
-            # 完了状態での絞り込み
-            if search_params.completed is not None:
-                query = query.filter(Todo.completed == search_params.completed)
-            
-            # 期限開始日時での絞り込み
-            if search_params.end_date_from is not None:
-                query = query.filter(Todo.end_date >= search_params.end_date_from)
+            # 結果を作成日時の降順でソートし、ページネーションを適用
+            skip = search_params.skip
+            limit = search_params.limit
+            stmt = self._search_stmt(search_params)
+            stmt += lambda s: s.order_by(Todo.created_at.desc(), Todo.id.desc()).offset(skip).limit(limit)
+            todos = self.db.execute(stmt).all()
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Search completed: found %d todos with params "
+                    "completed=%s, end_date_from=%s, end_date_to=%s, "
+                    "skip=%s, limit=%s",
+                    len(todos),
+                    search_params.completed,
+                    search_params.end_date_from,
+                    search_params.end_date_to,
+                    search_params.skip,
+                    search_params.limit
+                )
             
-            # 期限終了日時での絞り込み
-            if search_params.end_date_to is not None:
-                query = query.filter(Todo.end_date <= search_params.end_date_to)
+            return todos
             
-            # 結果を作成日時の降順でソートし、ページネーションを適用
-            todos = (
-                query
-                .order_by(Todo.created_at.desc())
-                .offset(search_params.skip)
-                .limit(search_params.limit)
-                .all()
-            )
+        except SQLAlchemyError as e:
+            logger.error("Failed to search todo items: %s", e)
+            raise
+    
+    def search_todos_by_cursor(self, search_params: TodoSearchParams) -> Tuple[Sequence[Row], bool]:
+        """
+        条件に基づいてToDoアイテムをカーソル（キーセット）方式で検索する
+        
+        (created_at, id) の降順で、カーソル位置より後ろの行をlimit件取得する。
+        OFFSETを使わないため、ページの深さに関わらずインデックスの範囲走査で済む。
+        次ページの有無はlimit+1件目を取得できたかで判定する。
+        
+        Args:
+            search_params (TodoSearchParams): 検索条件パラメータ（cursorが未指定の場合は先頭ページ）
             
-            logger.debug(
-                f"Search completed: found {len(todos)} todos with params "
-                f"completed={search_params.completed}, "
-                f"end_date_from={search_params.end_date_from}, "
-                f"end_date_to={search_params.end_date_to}, "
-                f"skip={search_params.skip}, limit={search_params.limit}"
-            )
+        Returns:
+            Tuple[Sequence[Row], bool]: ToDoアイテムの行のリストと次ページが存在するかどうか
             
-            return todos
+        Raises:
+            SQLAlchemyError: データベース操作エラー
+        """
+        try:
+            stmt = self._search_stmt(search_params)
+            if search_params.cursor is not None:
+                cursor_id, cursor_created_at = decode_cursor(search_params.cursor)
+                # 比較基準の作成日時はDBに保存された値を優先して使う
+                # （バインド値とのタイムスタンプ精度の違いによる取りこぼし・重複を防ぐ）
+                stmt += lambda s: s.where(
+                    tuple_(Todo.created_at, Todo.id) < tuple_(
+                        func.coalesce(
+                            select(Todo.created_at).where(Todo.id == cursor_id).scalar_subquery(),
+                            cursor_created_at
+                        ),
+                        cursor_id
+                    )
+                )
+            
+            fetch_limit = search_params.limit + 1
+            stmt += lambda s: s.order_by(Todo.created_at.desc(), Todo.id.desc()).limit(fetch_limit)
+            todos = self.db.execute(stmt).all()
+            has_more = len(todos) > search_params.limit
+            todos = todos[:search_params.limit]
+            
+            logger.debug("Cursor search completed: found %d todos (has_more=%s)", len(todos), has_more)
+            return todos, has_more
             
         except SQLAlchemyError as e:
-            logger.error(f"Failed to search todo items: {e}")
-            raise
\ No newline at end of file
+            logger.error("Failed to search todo items by cursor: %s", e)
+            raise
+    
+    @staticmethod
+    def _search_stmt(search_params: TodoSearchParams) -> StatementLambdaElement:
+        """
+        検索パラメータから絞り込み条件付きのSELECT文を生成する
+        
+        lambda_stmtで組み立てるため、SQLのコンパイル結果は条件の組み合わせごとにキャッシュされ、
+        2回目以降は文の構築とキャッシュキー生成を省略できる（値はバインドパラメータとして渡される）。
+        
+        Args:
+            search_params (TodoSearchParams): 検索条件パラメータ
+            
+        Returns:
+            StatementLambdaElement: 絞り込み条件を適用したSELECT文
+        """
+        completed = search_params.completed
+        end_date_from = search_params.end_date_from
+        end_date_to = search_params.end_date_to
+        
+        stmt = lambda_stmt(lambda: select(*LIST_COLUMNS))
+        
+        # 完了状態での絞り込み
+        if completed is not None:
+            stmt += lambda s: s.where(Todo.completed == completed)
+        
+        # 期限開始日時での絞り込み
+        if end_date_from is not None:
+            stmt += lambda s: s.where(Todo.end_date >= end_date_from)
+        
+        # 期限終了日時での絞り込み
+        if end_date_to is not None:
+            stmt += lambda s: s.where(Todo.end_date <= end_date_to)
+        
+        return stmt
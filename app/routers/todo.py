@@ -3,19 +3,28 @@ ToDoエンドポイント
 
 ToDoアイテムのCRUD操作を提供するAPIエンドポイントを実装する。
 """
-from typing import List, Optional
+from typing import Annotated, Callable, List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+import functools
+import hashlib
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response, status, Query
 import logging
 
-from app.database import get_db
-from app.schemas.todo import TodoCreate, TodoUpdate, TodoResponse, TodoSearchParams
+from app.schemas.todo import (
+    TodoCreate,
+    TodoUpdate,
+    TodoResponse,
+    TodoSearchParams,
+    TODO_LIST_ADAPTER,
+    decode_cursor,
+    encode_cursor
+)
 from app.services.todo import (
     TodoService, 
     TodoNotFoundError, 
     TodoValidationError, 
-    TodoDatabaseError
+    TodoDatabaseError,
+    get_todo_service
 )
 
 logger = logging.getLogger(__name__)
@@ -25,11 +34,137 @@ router = APIRouter(
     tags=["todos"]
 )
 
+# パスパラメータのToDoアイテムID（正の整数のみ受け付け、範囲外はFastAPIが422を返す）
+TodoId = Annotated[int, Path(gt=0, description="ToDo item ID (positive integer)")]
+
+# GETレスポンスのCache-Control（利用者ごとのデータのため共有キャッシュには保存させない）
+CACHE_CONTROL = "private, max-age=10"
+
+
+def _compute_etag(content: bytes) -> str:
+    """
+    レスポンス本文のバイト列からETagを算出する
+    
+    更新日時はDBによっては秒単位の精度しかなく、同じ秒内の更新でETagが変わらないため、
+    更新日時ではなく本文そのものから算出する。
+    """
+    return f'"{hashlib.md5(content, usedforsecurity=False).hexdigest()}"'
+
+
+def _is_not_modified(request: Request, etag: str) -> bool:
+    """If-None-MatchヘッダーがETagと一致するかどうかを判定する"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # 弱いETag（W/"..."）も同一とみなす
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def _conditional_json_response(request: Request, content: bytes, headers: dict) -> Response:
+    """
+    JSON本文にETag・Cache-Controlを付けたレスポンスを返す
+    
+    If-None-MatchがETagと一致する場合は本文を含めず304を返す。
+    """
+    headers["ETag"] = _compute_etag(content)
+    headers["Cache-Control"] = CACHE_CONTROL
+    if _is_not_modified(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def _todo_list_response(request: Request, todos: List[TodoResponse], headers: dict) -> Response:
+    """
+    ToDoアイテムのリストをレスポンスモデルの再検証なしでJSONレスポンスにする
+    
+    サービス層で検証済みのTodoResponseをTODO_LIST_ADAPTERで直接JSONバイト列にする
+    （中間のdictを作らない。response_modelはOpenAPIスキーマ用）。
+    If-None-Matchが本文から算出したETagと一致する場合は304を返す。
+    """
+    return _conditional_json_response(request, TODO_LIST_ADAPTER.dump_json(todos), headers)
+
+
+def _todo_response(todo: TodoResponse, status_code: int = status.HTTP_200_OK) -> Response:
+    """ToDoアイテム1件をレスポンスモデルの再検証なしで直接JSONバイト列のレスポンスにする"""
+    return Response(
+        content=todo.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+
+def _validate_cursor_params(cursor: Optional[str], skip: int) -> None:
+    """
+    カーソル指定時のクエリパラメータを検証する
+    
+    Args:
+        cursor (Optional[str]): 前ページのX-Next-Cursorヘッダーの値
+        skip (int): スキップする件数
+        
+    Raises:
+        HTTPException: カーソルがデコードできない場合、またはskipと併用された場合（422）
+    """
+    if cursor is None:
+        return
+    if skip:
+        detail = "skip cannot be combined with cursor"
+    else:
+        try:
+            decode_cursor(cursor)
+            return
+        except ValueError:
+            detail = "Invalid cursor"
+    logger.warning("Invalid cursor parameters: %s", detail)
+    raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+
+
+def map_todo_errors(failure_detail: str) -> Callable[[Callable], Callable]:
+    """
+    サービス層の例外をHTTPExceptionに変換するデコレーター
+    
+    各エンドポイントで共通の例外変換をまとめ、ハンドラー本体から try/except を取り除く。
+    
+    Args:
+        failure_detail (str): データベースエラー時にレスポンスへ含めるメッセージ
+        
+    Returns:
+        Callable[[Callable], Callable]: エンドポイント関数をラップするデコレーター
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except TodoNotFoundError as e:
+                logger.warning("Todo not found in %s: %s", func.__name__, e)
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Todo item with id {e.todo_id} not found"
+                )
+            except TodoValidationError as e:
+                logger.warning("Validation error in %s: %s", func.__name__, e)
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=str(e)
+                )
+            except TodoDatabaseError as e:
+                logger.error("Database error in %s: %s", func.__name__, e)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=failure_detail
+                )
+        return wrapper
+    return decorator
+
 
 @router.post("/", response_model=TodoResponse, status_code=status.HTTP_201_CREATED)
-async def create_todo(
+@map_todo_errors("Failed to create todo item")
+def create_todo(
     todo_data: TodoCreate,
-    db: Session = Depends(get_db)
+    service: TodoService = Depends(get_todo_service)
 ):
     """
     新しいToDoアイテムを作成する
@@ -42,7 +177,7 @@ async def create_todo(
             - description: タスクの説明（任意、最大1000文字）
             - completed: 完了状態（デフォルト: false）
             - end_date: 完了期限（任意、ISO 8601形式）
-        db (Session): データベースセッション
+        service (TodoService): ToDoサービス
         
     Returns:
         TodoResponse: 作成されたToDoアイテム
@@ -50,39 +185,38 @@ async def create_todo(
     Raises:
         HTTPException: バリデーションエラーまたはデータベースエラー
     """
-    try:
-        service = TodoService(db)
-        created_todo = service.create_todo(todo_data)
-        logger.info(f"Created todo item: {created_todo.id}")
-        return created_todo
-        
-    except TodoValidationError as e:
-        logger.warning(f"Validation error creating todo: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e)
-        )
-    except TodoDatabaseError as e:
-        logger.error(f"Database error creating todo: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create todo item"
-        )
+    created_todo = service.create_todo(todo_data)
+    logger.debug("Created todo item: %s", created_todo.id)
+    return _todo_response(created_todo, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/", response_model=List[TodoResponse], status_code=status.HTTP_200_OK)
-async def get_todos(
-    skip: int = Query(0, ge=0, description="Number of items to skip"),
+@map_todo_errors("Failed to retrieve todo items")
+def get_todos(
+    request: Request,
+    skip: int = Query(0, ge=0, deprecated=True, description="Number of items to skip (deprecated: use cursor)"),
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    exact_total: bool = Query(False, description="Return an exact X-Total-Count instead of an estimate"),
+    service: TodoService = Depends(get_todo_service)
 ):
     """
     すべてのToDoアイテムを取得する
     
+    cursorを指定した場合はキーセット方式で次ページを取得する。
+    次ページが存在する場合はそのカーソルをX-Next-Cursorヘッダーで返す。
+    skipによるオフセット方式では、総件数をX-Total-Countヘッダーで返す。
+    総件数は既定ではテーブル統計による概算値で、exact_total=trueの場合のみ正確な件数を数える。
+    カーソル方式のレスポンスには総件数を含めない。
+    ページ内容から算出したETagを返し、If-None-Matchが一致する場合は304を返す。
+    
     Args:
-        skip (int): スキップする件数（ページネーション用）
+        request (Request): リクエスト（If-None-Matchの参照用）
+        skip (int): スキップする件数（ページネーション用、非推奨）
         limit (int): 取得する最大件数
-        db (Session): データベースセッション
+        cursor (Optional[str]): 前ページのX-Next-Cursorヘッダーの値
+        exact_total (bool): 正確な総件数を返すかどうか
+        service (TodoService): ToDoサービス
         
     Returns:
         List[TodoResponse]: ToDoアイテムのリスト
@@ -90,47 +224,58 @@ async def get_todos(
     Raises:
         HTTPException: バリデーションエラーまたはデータベースエラー
     """
-    try:
-        service = TodoService(db)
-        todos = service.get_all_todos(skip, limit)
-        logger.debug(f"Retrieved {len(todos)} todo items")
-        return todos
-        
-    except TodoValidationError as e:
-        logger.warning(f"Validation error getting todos: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e)
-        )
-    except TodoDatabaseError as e:
-        logger.error(f"Database error getting todos: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve todo items"
+    _validate_cursor_params(cursor, skip)
+    headers = {}
+    if cursor is not None:
+        # カーソルは検証済みのため、モデルの再検証は行わずに組み立てる
+        page = service.search_todos_by_cursor(
+            TodoSearchParams.model_construct(cursor=cursor, skip=skip, limit=limit)
         )
+        if page.next_cursor:
+            headers["X-Next-Cursor"] = page.next_cursor
+        todos = page.items
+    else:
+        todos, total, has_more = service.get_todos_page(skip, limit, exact_total)
+        headers["X-Total-Count"] = str(total)
+        if has_more:
+            # 以降のページはカーソル方式で取得できるようにする
+            # （次ページの有無は概算の総件数ではなく、実際に取得した行から判定する）
+            last = todos[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last.id, last.created_at)
+    logger.debug("Retrieved %d todo items", len(todos))
+    return _todo_list_response(request, todos, headers)
 
 
 @router.get("/search", response_model=List[TodoResponse], status_code=status.HTTP_200_OK)
-async def search_todos(
+@map_todo_errors("Failed to search todo items")
+def search_todos(
+    request: Request,
     completed: Optional[bool] = Query(None, description="Filter by completion status"),
     end_date_from: Optional[datetime] = Query(None, description="Filter todos with end_date from this datetime (ISO 8601 format)"),
     end_date_to: Optional[datetime] = Query(None, description="Filter todos with end_date until this datetime (ISO 8601 format)"),
-    skip: int = Query(0, ge=0, description="Number of records to skip for pagination"),
+    skip: int = Query(0, ge=0, deprecated=True, description="Number of records to skip for pagination (deprecated: use cursor)"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return (1-1000)"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    service: TodoService = Depends(get_todo_service)
 ):
     """
     条件に基づいてToDoアイテムを検索する
     
     Search for todo items based on various criteria including completion status and deadline ranges.
+    The first page and pages requested with a cursor use keyset pagination;
+    the cursor for the next page is returned in the X-Next-Cursor header.
+    Search responses never include a total count (no COUNT(*) is issued for filtered lists).
+    An ETag for the page is returned; a matching If-None-Match yields 304 Not Modified.
     
     Args:
+        request (Request): Incoming request (used for If-None-Match)
         completed (Optional[bool]): Filter by completion status
         end_date_from (Optional[datetime]): Filter todos with end_date from this datetime
         end_date_to (Optional[datetime]): Filter todos with end_date until this datetime
-        skip (int): Number of records to skip for pagination
+        skip (int): Number of records to skip for pagination (deprecated)
         limit (int): Maximum number of records to return
-        db (Session): データベースセッション
+        cursor (Optional[str]): Cursor from the X-Next-Cursor header of the previous page
+        service (TodoService): ToDoサービス
         
     Returns:
         List[TodoResponse]: 検索条件に一致するToDoアイテムのリスト
@@ -143,93 +288,68 @@ async def search_todos(
         - Get overdue todos: GET /todos/search?end_date_to=2025-01-08T12:00:00Z
         - Get today's todos: GET /todos/search?end_date_from=2025-01-08T00:00:00Z&end_date_to=2025-01-08T23:59:59Z
         - Get incomplete overdue todos: GET /todos/search?completed=false&end_date_to=2025-01-08T12:00:00Z
+        - Get the next page: GET /todos/search?completed=false&cursor=<X-Next-Cursor>
     """
-    try:
-        # Create search parameters object
-        search_params = TodoSearchParams(
-            completed=completed,
-            end_date_from=end_date_from,
-            end_date_to=end_date_to,
-            skip=skip,
-            limit=limit
-        )
-        
-        service = TodoService(db)
+    # クエリパラメータの型・範囲はFastAPIで検証済みのため、モデルの再検証は行わずに組み立てる
+    # （日時範囲はサービス層で検証されるため、ここではカーソルの検証のみ行う）
+    _validate_cursor_params(cursor, skip)
+    search_params = TodoSearchParams.model_construct(
+        completed=completed,
+        end_date_from=end_date_from,
+        end_date_to=end_date_to,
+        skip=skip,
+        limit=limit,
+        cursor=cursor
+    )
+    
+    headers = {}
+    if skip == 0:
+        # 先頭ページとカーソル指定時はキーセット方式で取得する
+        page = service.search_todos_by_cursor(search_params)
+        if page.next_cursor:
+            headers["X-Next-Cursor"] = page.next_cursor
+        todos = page.items
+    else:
         todos = service.search_todos(search_params)
-        
-        logger.info(f"Search completed: found {len(todos)} todos matching criteria")
-        return todos
-        
-    except ValueError as e:
-        # Handle Pydantic validation errors (e.g., date range validation)
-        logger.warning(f"Validation error in search parameters: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e)
-        )
-    except TodoValidationError as e:
-        logger.warning(f"Service validation error searching todos: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e)
-        )
-    except TodoDatabaseError as e:
-        logger.error(f"Database error searching todos: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to search todo items"
-        )
+    
+    logger.debug("Search completed: found %d todos matching criteria", len(todos))
+    return _todo_list_response(request, todos, headers)
 
 
 @router.get("/{todo_id}", response_model=TodoResponse, status_code=status.HTTP_200_OK)
-async def get_todo(
-    todo_id: int,
-    db: Session = Depends(get_db)
+@map_todo_errors("Failed to retrieve todo item")
+def get_todo(
+    todo_id: TodoId,
+    request: Request,
+    service: TodoService = Depends(get_todo_service)
 ):
     """
     特定のToDoアイテムを取得する
     
     Args:
         todo_id (int): 取得するToDoアイテムのID
-        db (Session): データベースセッション
+        request (Request): リクエスト（If-None-Matchの参照用）
+        service (TodoService): ToDoサービス
         
     Returns:
-        TodoResponse: 見つかったToDoアイテム
+        TodoResponse: 見つかったToDoアイテム（ETagが一致する場合は304レスポンス）
         
     Raises:
         HTTPException: ToDoアイテムが見つからない場合またはデータベースエラー
     """
-    try:
-        service = TodoService(db)
-        todo = service.get_todo_by_id(todo_id)
-        logger.debug(f"Retrieved todo item: {todo_id}")
-        return todo
-        
-    except TodoNotFoundError as e:
-        logger.warning(f"Todo not found: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Todo item with id {todo_id} not found"
-        )
-    except TodoValidationError as e:
-        logger.warning(f"Validation error getting todo: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e)
-        )
-    except TodoDatabaseError as e:
-        logger.error(f"Database error getting todo: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve todo item"
-        )
+    todo = service.get_todo_by_id(todo_id)
+    logger.debug("Retrieved todo item: %s", todo_id)
+    
+    # 本文から算出したETagがIf-None-Matchと一致する場合は本文を返さない
+    return _conditional_json_response(request, todo.model_dump_json().encode(), {})
 
 
 @router.put("/{todo_id}", response_model=TodoResponse, status_code=status.HTTP_200_OK)
-async def update_todo(
-    todo_id: int,
+@map_todo_errors("Failed to update todo item")
+def update_todo(
+    todo_id: TodoId,
     todo_data: TodoUpdate,
-    db: Session = Depends(get_db)
+    service: TodoService = Depends(get_todo_service)
 ):
     """
     ToDoアイテムを更新する
@@ -243,7 +363,7 @@ async def update_todo(
             - description: タスクの説明（任意、最大1000文字）
             - completed: 完了状態（任意）
             - end_date: 完了期限（任意、ISO 8601形式、nullで削除可能）
-        db (Session): データベースセッション
+        service (TodoService): ToDoサービス
         
     Returns:
         TodoResponse: 更新されたToDoアイテム
@@ -251,67 +371,26 @@ async def update_todo(
     Raises:
         HTTPException: ToDoアイテムが見つからない場合またはバリデーションエラー
     """
-    try:
-        service = TodoService(db)
-        updated_todo = service.update_todo(todo_id, todo_data)
-        logger.info(f"Updated todo item: {todo_id}")
-        return updated_todo
-        
-    except TodoNotFoundError as e:
-        logger.warning(f"Todo not found for update: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Todo item with id {todo_id} not found"
-        )
-    except TodoValidationError as e:
-        logger.warning(f"Validation error updating todo: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e)
-        )
-    except TodoDatabaseError as e:
-        logger.error(f"Database error updating todo: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update todo item"
-        )
+    updated_todo = service.update_todo(todo_id, todo_data)
+    logger.debug("Updated todo item: %s", todo_id)
+    return _todo_response(updated_todo)
 
 
 @router.delete("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_todo(
-    todo_id: int,
-    db: Session = Depends(get_db)
+@map_todo_errors("Failed to delete todo item")
+def delete_todo(
+    todo_id: TodoId,
+    service: TodoService = Depends(get_todo_service)
 ):
     """
     ToDoアイテムを削除する
     
     Args:
         todo_id (int): 削除するToDoアイテムのID
-        db (Session): データベースセッション
+        service (TodoService): ToDoサービス
         
     Raises:
         HTTPException: ToDoアイテムが見つからない場合またはデータベースエラー
     """
-    try:
-        service = TodoService(db)
-        service.delete_todo(todo_id)
-        logger.info(f"Deleted todo item: {todo_id}")
-        
-    except TodoNotFoundError as e:
-        logger.warning(f"Todo not found for deletion: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Todo item with id {todo_id} not found"
-        )
-    except TodoValidationError as e:
-        logger.warning(f"Validation error deleting todo: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e)
-        )
-    except TodoDatabaseError as e:
-        logger.error(f"Database error deleting todo: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to delete todo item"
-        )
\ No newline at end of file
+    service.delete_todo(todo_id)
+    logger.debug("Deleted todo item: %s", todo_id)
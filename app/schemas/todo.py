@@ -1,6 +1,9 @@
+import base64
+import binascii
+import json
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Annotated, List, Optional, Tuple
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter, field_validator, model_validator
 
 
 # Constants for field validation
@@ -8,17 +11,54 @@ TITLE_MAX_LENGTH = 200
 DESCRIPTION_MAX_LENGTH = 1000
 
 
+def _empty_to_none(v: str) -> Optional[str]:
+    """Normalize an empty (whitespace-only) description to None."""
+    return v or None
+
+
+# Stripping and length checks run in pydantic-core rather than Python validators
+TitleStr = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, min_length=1, max_length=TITLE_MAX_LENGTH)
+]
+DescriptionStr = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, max_length=DESCRIPTION_MAX_LENGTH),
+    AfterValidator(_empty_to_none)
+]
+
+
+def encode_cursor(todo_id: int, created_at: datetime) -> str:
+    """Encode the keyset position of a todo as an opaque base64url cursor."""
+    payload = json.dumps(
+        {"id": todo_id, "created_at": created_at.isoformat()},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, datetime]:
+    """Decode a cursor produced by encode_cursor into (id, created_at)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        todo_id = payload["id"]
+        created_at = datetime.fromisoformat(payload["created_at"])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(todo_id, int) or isinstance(todo_id, bool) or todo_id <= 0:
+        raise ValueError("Invalid cursor")
+    return todo_id, created_at
+
+
 class TodoBase(BaseModel):
     """Base schema for Todo items with common fields."""
-    title: str = Field(
+    title: TitleStr = Field(
         ...,
-        min_length=1,
-        max_length=TITLE_MAX_LENGTH,
         description=f"Todo title (required, max {TITLE_MAX_LENGTH} characters)"
     )
-    description: Optional[str] = Field(
+    description: Optional[DescriptionStr] = Field(
         None,
-        max_length=DESCRIPTION_MAX_LENGTH,
         description=(
             f"Todo description (optional, max {DESCRIPTION_MAX_LENGTH} "
             "characters)"
@@ -30,23 +70,6 @@ class TodoBase(BaseModel):
         description="Task deadline in ISO 8601 format (e.g., '2025-01-15T10:30:00Z'). Optional field for setting task completion deadlines."
     )
 
-    @field_validator('title')
-    @classmethod
-    def validate_title(cls, v: str) -> str:
-        """Validate title is not just whitespace."""
-        if v and not v.strip():
-            raise ValueError('Title cannot be empty or just whitespace')
-        return v.strip() if v else v
-
-    @field_validator('description')
-    @classmethod
-    def validate_description(cls, v: Optional[str]) -> Optional[str]:
-        """Validate and clean description."""
-        if v is not None:
-            v = v.strip()
-            return v if v else None
-        return v
-
 
 class TodoCreate(TodoBase):
     """Schema for creating a new Todo item."""
@@ -55,15 +78,12 @@ class TodoCreate(TodoBase):
 
 class TodoUpdate(BaseModel):
     """Schema for updating an existing Todo item."""
-    title: Optional[str] = Field(
+    title: Optional[TitleStr] = Field(
         None,
-        min_length=1,
-        max_length=TITLE_MAX_LENGTH,
         description=f"Todo title (optional, max {TITLE_MAX_LENGTH} characters)"
     )
-    description: Optional[str] = Field(
+    description: Optional[DescriptionStr] = Field(
         None,
-        max_length=DESCRIPTION_MAX_LENGTH,
         description=(
             f"Todo description (optional, max {DESCRIPTION_MAX_LENGTH} "
             "characters)"
@@ -82,8 +102,12 @@ class TodoResponse(TodoBase):
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# List validator/serializer shared by the service and router.
+# Validating the whole list in one call keeps the per-item loop inside pydantic-core.
+TODO_LIST_ADAPTER = TypeAdapter(List[TodoResponse])
 
 
 class TodoSearchParams(BaseModel):
@@ -111,6 +135,18 @@ class TodoSearchParams(BaseModel):
         le=1000, 
         description="Maximum number of records to return (1-1000)"
     )
+    cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor returned in X-Next-Cursor to fetch the next page"
+    )
+
+    @field_validator('cursor')
+    @classmethod
+    def validate_cursor(cls, v: Optional[str]) -> Optional[str]:
+        """Validate that the cursor can be decoded."""
+        if v is not None:
+            decode_cursor(v)
+        return v
 
     @model_validator(mode='after')
     def validate_date_range(self) -> 'TodoSearchParams':
@@ -119,3 +155,19 @@ class TodoSearchParams(BaseModel):
             self.end_date_from > self.end_date_to):
             raise ValueError('end_date_from must be before or equal to end_date_to')
         return self
+
+    @model_validator(mode='after')
+    def validate_cursor_pagination(self) -> 'TodoSearchParams':
+        """Validate that cursor and skip are not combined."""
+        if self.cursor is not None and self.skip:
+            raise ValueError('skip cannot be combined with cursor')
+        return self
+
+
+class PaginatedTodoResponse(BaseModel):
+    """Schema for a cursor-paginated page of Todo items."""
+    items: List[TodoResponse] = Field(..., description="Todo items in this page")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor for the next page (null on the last page)"
+    )
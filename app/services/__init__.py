@@ -1,10 +1,17 @@
 # Business logic layer
 
-from .todo import TodoService, TodoNotFoundError, TodoValidationError, TodoDatabaseError
+from .todo import (
+    TodoService,
+    TodoNotFoundError,
+    TodoValidationError,
+    TodoDatabaseError,
+    get_todo_service
+)
 
 __all__ = [
     "TodoService",
     "TodoNotFoundError", 
     "TodoValidationError",
-    "TodoDatabaseError"
+    "TodoDatabaseError",
+    "get_todo_service"
 ]
\ No newline at end of file
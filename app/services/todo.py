@@ -4,17 +4,34 @@ ToDoサービス
 ToDoアイテムのビジネスロジック層を実装する。
 データバリデーション、エラーハンドリング、ビジネスルールを管理する。
 """
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
+import functools
+import inspect
+from fastapi import Depends
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
+from app.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.database import get_db
 from app.models.todo import Todo
-from app.schemas.todo import TodoCreate, TodoUpdate, TodoResponse, TodoSearchParams
+from app.schemas.todo import (
+    TodoCreate,
+    TodoUpdate,
+    TodoResponse,
+    TodoSearchParams,
+    PaginatedTodoResponse,
+    TODO_LIST_ADAPTER,
+    encode_cursor
+)
 from app.repositories.todo import TodoRepository
+from app.services import todo_cache
 
 logger = logging.getLogger(__name__)
 
+# 単一アイテムの検証はpydantic-coreの検証器を直接呼び出し、model_validateの呼び出し経路を省く
+_validate_todo = TodoResponse.__pydantic_validator__.validate_python
+
 
 class TodoNotFoundError(Exception):
     """ToDoアイテムが見つからない場合の例外"""
@@ -38,6 +55,48 @@ class TodoDatabaseError(Exception):
         super().__init__(message)
 
 
+def translate_db_errors(action: str, gerund: str) -> Callable[[Callable], Callable]:
+    """
+    サービスメソッドの例外をTodoDatabaseErrorに変換するデコレーター
+    
+    ドメイン例外（TodoNotFoundError、TodoValidationError）はそのまま送出し、
+    それ以外の例外をTodoDatabaseErrorに変換する。
+    メッセージ中の {引数名} はエラー発生時のみメソッドの引数で置き換える。
+    
+    Args:
+        action (str): 失敗時メッセージ（"Failed to ..."）に含める操作名
+        gerund (str): 予期しないエラー時メッセージ（"... while ..."）に含める操作名
+        
+    Returns:
+        Callable[[Callable], Callable]: サービスメソッドをラップするデコレーター
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        def describe(template: str, args: tuple, kwargs: dict) -> str:
+            if "{" not in template:
+                return template
+            bound = signature.bind(*args, **kwargs)
+            return template.format(**bound.arguments)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except (TodoNotFoundError, TodoValidationError):
+                raise
+            except SQLAlchemyError as e:
+                message = describe(gerund, args, kwargs)
+                logger.error("Database error while %s: %s", message, e)
+                raise TodoDatabaseError(f"Failed to {describe(action, args, kwargs)}", e)
+            except Exception as e:
+                message = describe(gerund, args, kwargs)
+                logger.error("Unexpected error while %s: %s", message, e)
+                raise TodoDatabaseError(f"Unexpected error occurred while {message}", e)
+        return wrapper
+    return decorator
+
+
 class TodoService:
     """
     ToDoアイテムのビジネスロジックを管理するサービスクラス
@@ -55,6 +114,7 @@ class TodoService:
         """
         self.repository = TodoRepository(db)
     
+    @translate_db_errors("create todo item", "creating todo item")
     def create_todo(self, todo_data: TodoCreate) -> TodoResponse:
         """
         新しいToDoアイテムを作成する
@@ -69,25 +129,18 @@ class TodoService:
             TodoValidationError: バリデーションエラー
             TodoDatabaseError: データベース操作エラー
         """
-        try:
-            # ビジネスルールのバリデーション
-            self._validate_todo_create(todo_data)
-            
-            # リポジトリを使用してデータを作成
-            db_todo = self.repository.create(todo_data)
-            
-            logger.info(f"Successfully created todo item: {db_todo.id}")
-            return TodoResponse.model_validate(db_todo)
-            
-        except TodoValidationError:
-            raise
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while creating todo: {e}")
-            raise TodoDatabaseError("Failed to create todo item", e)
-        except Exception as e:
-            logger.error(f"Unexpected error while creating todo: {e}")
-            raise TodoDatabaseError("Unexpected error occurred while creating todo item", e)
+        # ビジネスルールのバリデーション
+        self._validate_todo_create(todo_data)
+        
+        # リポジトリを使用してデータを作成
+        db_todo = self.repository.create(todo_data)
+        # 同じIDで古いエントリが残っている場合に備えて無効化する
+        todo_cache.invalidate(db_todo.id)
+        
+        logger.debug("Successfully created todo item: %s", db_todo.id)
+        return _validate_todo(db_todo, from_attributes=True)
     
+    @translate_db_errors("retrieve todo item {todo_id}", "retrieving todo item {todo_id}")
     def get_todo_by_id(self, todo_id: int) -> TodoResponse:
         """
         IDでToDoアイテムを取得する
@@ -96,34 +149,32 @@ class TodoService:
             todo_id (int): 取得するToDoアイテムのID
             
         Returns:
-            TodoResponse: 見つかったToDoアイテム
+            TodoResponse: 見つかったToDoアイテム（キャッシュと共有されるため変更してはならない）
             
         Raises:
             TodoNotFoundError: ToDoアイテムが見つからない場合
             TodoDatabaseError: データベース操作エラー
         """
-        try:
-            # IDのバリデーション
-            self._validate_todo_id(todo_id)
-            
-            db_todo = self.repository.get_by_id(todo_id)
-            if not db_todo:
-                logger.warning(f"Todo item not found: {todo_id}")
-                raise TodoNotFoundError(todo_id)
-            
-            logger.debug(f"Successfully retrieved todo item: {todo_id}")
-            return TodoResponse.model_validate(db_todo)
-            
-        except (TodoNotFoundError, TodoValidationError):
-            raise
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while getting todo {todo_id}: {e}")
-            raise TodoDatabaseError(f"Failed to retrieve todo item {todo_id}", e)
-        except Exception as e:
-            logger.error(f"Unexpected error while getting todo {todo_id}: {e}")
-            raise TodoDatabaseError(f"Unexpected error occurred while retrieving todo item {todo_id}", e)
+        cached_todo = todo_cache.get(todo_id)
+        if cached_todo is not None:
+            logger.debug("Retrieved todo item from cache: %s", todo_id)
+            return cached_todo
+        
+        # 読み取り中に更新・削除された場合に古い行を格納しないよう、DB参照前の世代番号を控える
+        generation = todo_cache.generation()
+        db_todo = self.repository.get_by_id(todo_id)
+        if not db_todo:
+            logger.warning("Todo item not found: %s", todo_id)
+            raise TodoNotFoundError(todo_id)
+        
+        todo = _validate_todo(db_todo, from_attributes=True)
+        todo_cache.put(todo_id, todo, generation)
+        
+        logger.debug("Successfully retrieved todo item: %s", todo_id)
+        return todo
     
-    def get_all_todos(self, skip: int = 0, limit: int = 100) -> List[TodoResponse]:
+    @translate_db_errors("retrieve todo items", "retrieving todo items")
+    def get_all_todos(self, skip: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> List[TodoResponse]:
         """
         すべてのToDoアイテムを取得する
         
@@ -138,24 +189,58 @@ class TodoService:
             TodoValidationError: パラメータのバリデーションエラー
             TodoDatabaseError: データベース操作エラー
         """
-        try:
-            # パラメータのバリデーション
-            self._validate_pagination_params(skip, limit)
-            
-            db_todos = self.repository.get_all(skip, limit)
+        # パラメータのバリデーション
+        self._validate_pagination_params(skip, limit)
+        
+        db_todos = self.repository.get_all(skip, limit)
+        
+        logger.debug("Successfully retrieved %d todo items", len(db_todos))
+        return TODO_LIST_ADAPTER.validate_python(db_todos, from_attributes=True)
+    
+    @translate_db_errors("retrieve todo items", "retrieving todo items")
+    def get_todos_page(
+        self, skip: int = 0, limit: int = DEFAULT_PAGE_SIZE, exact_total: bool = False
+    ) -> Tuple[List[TodoResponse], int, bool]:
+        """
+        ToDoアイテムの1ページ分と総件数、次ページの有無を取得する
+        
+        exact_totalがFalseの場合はテーブル統計による概算件数を総件数として返し、
+        COUNT(*)を発行しない。概算件数が得られない場合は正確な件数を返す。
+        次ページの有無は概算件数ではなく、limit+1件目を取得できたかで判定する
+        （統計が古く概算件数が実際より少ない場合でも、後続ページを取りこぼさない）。
+        
+        Args:
+            skip (int): スキップする件数（ページネーション用）
+            limit (int): 取得する最大件数
+            exact_total (bool): 正確な総件数を取得するかどうか（デフォルト: False）
             
-            logger.debug(f"Successfully retrieved {len(db_todos)} todo items")
-            return [TodoResponse.model_validate(todo) for todo in db_todos]
+        Returns:
+            Tuple[List[TodoResponse], int, bool]: ToDoアイテムのリスト、総件数、次ページが存在するかどうか
             
-        except TodoValidationError:
-            raise
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while getting all todos: {e}")
-            raise TodoDatabaseError("Failed to retrieve todo items", e)
-        except Exception as e:
-            logger.error(f"Unexpected error while getting all todos: {e}")
-            raise TodoDatabaseError("Unexpected error occurred while retrieving todo items", e)
+        Raises:
+            TodoValidationError: パラメータのバリデーションエラー
+            TodoDatabaseError: データベース操作エラー
+        """
+        # パラメータのバリデーション
+        self._validate_pagination_params(skip, limit)
+        
+        estimate = None if exact_total else self.repository.estimate_count_all()
+        if estimate is None:
+            db_todos, total = self.repository.get_page(skip, limit + 1)
+        else:
+            db_todos = self.repository.get_all(skip, limit + 1)
+        has_more = len(db_todos) > limit
+        db_todos = db_todos[:limit]
+        if estimate is not None:
+            # 統計が古い場合でも、実際に取得できた件数を下回らないようにする
+            total = max(estimate, skip + len(db_todos) + (1 if has_more else 0))
+        
+        logger.debug(
+            "Successfully retrieved %d of %s todo items (has_more=%s)", len(db_todos), total, has_more
+        )
+        return TODO_LIST_ADAPTER.validate_python(db_todos, from_attributes=True), total, has_more
     
+    @translate_db_errors("update todo item {todo_id}", "updating todo item {todo_id}")
     def update_todo(self, todo_id: int, todo_data: TodoUpdate) -> TodoResponse:
         """
         ToDoアイテムを更新する
@@ -172,34 +257,20 @@ class TodoService:
             TodoValidationError: バリデーションエラー
             TodoDatabaseError: データベース操作エラー
         """
-        try:
-            # IDのバリデーション
-            self._validate_todo_id(todo_id)
-            
-            # 更新データのバリデーション
-            self._validate_todo_update(todo_data)
-            
-            # 更新前にアイテムの存在確認
-            existing_todo = self.repository.get_by_id(todo_id)
-            if not existing_todo:
-                logger.warning(f"Todo item not found for update: {todo_id}")
-                raise TodoNotFoundError(todo_id)
-            
-            # リポジトリを使用してデータを更新
-            updated_todo = self.repository.update(todo_id, todo_data)
-            
-            logger.info(f"Successfully updated todo item: {todo_id}")
-            return TodoResponse.model_validate(updated_todo)
-            
-        except (TodoNotFoundError, TodoValidationError):
-            raise
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while updating todo {todo_id}: {e}")
-            raise TodoDatabaseError(f"Failed to update todo item {todo_id}", e)
-        except Exception as e:
-            logger.error(f"Unexpected error while updating todo {todo_id}: {e}")
-            raise TodoDatabaseError(f"Unexpected error occurred while updating todo item {todo_id}", e)
+        # 更新データのバリデーション
+        self._validate_todo_update(todo_data)
+        
+        # リポジトリを使用してデータを更新（対象が存在しない場合はNoneが返る）
+        updated_todo = self.repository.update(todo_id, todo_data)
+        todo_cache.invalidate(todo_id)
+        if updated_todo is None:
+            logger.warning("Todo item not found for update: %s", todo_id)
+            raise TodoNotFoundError(todo_id)
+        
+        logger.debug("Successfully updated todo item: %s", todo_id)
+        return _validate_todo(updated_todo, from_attributes=True)
     
+    @translate_db_errors("delete todo item {todo_id}", "deleting todo item {todo_id}")
     def delete_todo(self, todo_id: int) -> bool:
         """
         ToDoアイテムを削除する
@@ -212,64 +283,45 @@ class TodoService:
             
         Raises:
             TodoNotFoundError: ToDoアイテムが見つからない場合
-            TodoValidationError: バリデーションエラー
             TodoDatabaseError: データベース操作エラー
         """
-        try:
-            # IDのバリデーション
-            self._validate_todo_id(todo_id)
-            
-            # 削除前にアイテムの存在確認
-            existing_todo = self.repository.get_by_id(todo_id)
-            if not existing_todo:
-                logger.warning(f"Todo item not found for deletion: {todo_id}")
-                raise TodoNotFoundError(todo_id)
-            
-            # リポジトリを使用してデータを削除
-            success = self.repository.delete(todo_id)
-            
-            if success:
-                logger.info(f"Successfully deleted todo item: {todo_id}")
-            
-            return success
-            
-        except TodoNotFoundError:
-            raise
-        except TodoValidationError:
-            raise
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while deleting todo {todo_id}: {e}")
-            raise TodoDatabaseError(f"Failed to delete todo item {todo_id}", e)
-        except Exception as e:
-            logger.error(f"Unexpected error while deleting todo {todo_id}: {e}")
-            raise TodoDatabaseError(f"Unexpected error occurred while deleting todo item {todo_id}", e)
+        # リポジトリを使用してデータを削除（対象が存在しない場合はFalseが返る）
+        success = self.repository.delete(todo_id)
+        todo_cache.invalidate(todo_id)
+        if not success:
+            logger.warning("Todo item not found for deletion: %s", todo_id)
+            raise TodoNotFoundError(todo_id)
+        
+        logger.debug("Successfully deleted todo item: %s", todo_id)
+        return success
     
-    def get_todos_by_status(self, completed: bool) -> List[TodoResponse]:
+    @translate_db_errors("retrieve todo items by status", "retrieving todo items by status")
+    def get_todos_by_status(
+        self, completed: bool, skip: int = 0, limit: int = DEFAULT_PAGE_SIZE
+    ) -> List[TodoResponse]:
         """
         完了状態でToDoアイテムを取得する
         
         Args:
             completed (bool): 完了状態（True: 完了済み、False: 未完了）
+            skip (int): スキップする件数（デフォルト: 0）
+            limit (int): 取得する最大件数（デフォルト: DEFAULT_PAGE_SIZE）
             
         Returns:
             List[TodoResponse]: 指定された完了状態のToDoアイテムのリスト
             
         Raises:
+            TodoValidationError: ページネーションパラメータが無効な場合
             TodoDatabaseError: データベース操作エラー
         """
-        try:
-            db_todos = self.repository.get_by_completion_status(completed)
-            
-            logger.debug(f"Successfully retrieved {len(db_todos)} todo items with completed={completed}")
-            return [TodoResponse.model_validate(todo) for todo in db_todos]
-            
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while getting todos by status: {e}")
-            raise TodoDatabaseError("Failed to retrieve todo items by status", e)
-        except Exception as e:
-            logger.error(f"Unexpected error while getting todos by status: {e}")
-            raise TodoDatabaseError("Unexpected error occurred while retrieving todo items by status", e)
+        self._validate_pagination_params(skip, limit)
+        
+        db_todos = self.repository.get_by_completion_status(completed, skip, limit)
+        
+        logger.debug("Successfully retrieved %d todo items with completed=%s", len(db_todos), completed)
+        return TODO_LIST_ADAPTER.validate_python(db_todos, from_attributes=True)
     
+    @translate_db_errors("retrieve todo statistics", "retrieving todo statistics")
     def get_todo_statistics(self) -> dict:
         """
         ToDoアイテムの統計情報を取得する
@@ -280,28 +332,20 @@ class TodoService:
         Raises:
             TodoDatabaseError: データベース操作エラー
         """
-        try:
-            total_count = self.repository.count_all()
-            completed_count = self.repository.count_by_completion_status(True)
-            pending_count = self.repository.count_by_completion_status(False)
-            
-            statistics = {
-                "total": total_count,
-                "completed": completed_count,
-                "pending": pending_count,
-                "completion_rate": round((completed_count / total_count * 100), 2) if total_count > 0 else 0.0
-            }
-            
-            logger.debug(f"Retrieved todo statistics: {statistics}")
-            return statistics
-            
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while getting todo statistics: {e}")
-            raise TodoDatabaseError("Failed to retrieve todo statistics", e)
-        except Exception as e:
-            logger.error(f"Unexpected error while getting todo statistics: {e}")
-            raise TodoDatabaseError("Unexpected error occurred while retrieving todo statistics", e)
+        total_count, completed_count = self.repository.get_stats()
+        pending_count = total_count - completed_count
+        
+        statistics = {
+            "total": total_count,
+            "completed": completed_count,
+            "pending": pending_count,
+            "completion_rate": round((completed_count / total_count * 100), 2) if total_count > 0 else 0.0
+        }
+        
+        logger.debug("Retrieved todo statistics: %s", statistics)
+        return statistics
     
+    @translate_db_errors("search todo items", "searching todo items")
     def search_todos(self, search_params: TodoSearchParams) -> List[TodoResponse]:
         """
         条件に基づいてToDoアイテムを検索する
@@ -316,30 +360,44 @@ class TodoService:
             TodoValidationError: 検索パラメータのバリデーションエラー
             TodoDatabaseError: データベース操作エラー
         """
-        try:
-            # 検索パラメータのバリデーション
-            self._validate_search_params(search_params)
-            
-            # リポジトリを使用して検索を実行
-            db_todos = self.repository.search_todos(search_params)
-            
-            logger.info(
-                f"Search completed successfully: found {len(db_todos)} todos with "
-                f"completed={search_params.completed}, "
-                f"end_date_from={search_params.end_date_from}, "
-                f"end_date_to={search_params.end_date_to}"
-            )
+        # 検索パラメータのバリデーション
+        self._validate_search_params(search_params)
+        
+        # リポジトリを使用して検索を実行
+        # 検索条件と件数のデバッグログはリポジトリ側で出力する
+        db_todos = self.repository.search_todos(search_params)
+        
+        return TODO_LIST_ADAPTER.validate_python(db_todos, from_attributes=True)
+    
+    @translate_db_errors("search todo items", "searching todo items")
+    def search_todos_by_cursor(self, search_params: TodoSearchParams) -> PaginatedTodoResponse:
+        """
+        条件に基づいてToDoアイテムをカーソル方式で検索する
+        
+        Args:
+            search_params (TodoSearchParams): 検索条件パラメータ（cursorが未指定の場合は先頭ページ）
             
-            return [TodoResponse.model_validate(todo) for todo in db_todos]
+        Returns:
+            PaginatedTodoResponse: ToDoアイテムのリストと次ページのカーソル
             
-        except TodoValidationError:
-            raise
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while searching todos: {e}")
-            raise TodoDatabaseError("Failed to search todo items", e)
-        except Exception as e:
-            logger.error(f"Unexpected error while searching todos: {e}")
-            raise TodoDatabaseError("Unexpected error occurred while searching todo items", e)
+        Raises:
+            TodoValidationError: 検索パラメータのバリデーションエラー
+            TodoDatabaseError: データベース操作エラー
+        """
+        self._validate_search_params(search_params)
+        
+        db_todos, has_more = self.repository.search_todos_by_cursor(search_params)
+        
+        next_cursor = None
+        if has_more and db_todos:
+            last = db_todos[-1]
+            next_cursor = encode_cursor(last.id, last.created_at)
+        
+        logger.debug("Cursor search completed: found %d todos (has_more=%s)", len(db_todos), has_more)
+        return PaginatedTodoResponse(
+            items=TODO_LIST_ADAPTER.validate_python(db_todos, from_attributes=True),
+            next_cursor=next_cursor
+        )
     
     def _validate_todo_create(self, todo_data: TodoCreate) -> None:
         """
@@ -351,10 +409,12 @@ class TodoService:
         Raises:
             TodoValidationError: バリデーションエラー
         """
-        if not todo_data.title or not todo_data.title.strip():
+        # 前後空白の除去は1回だけ行い、空チェックと長さチェックで共用する
+        stripped = todo_data.title.strip() if todo_data.title else ""
+        if not stripped:
             raise TodoValidationError("Title cannot be empty or whitespace only")
         
-        if len(todo_data.title.strip()) > 200:
+        if len(stripped) > 200:
             raise TodoValidationError("Title cannot exceed 200 characters")
         
         if todo_data.description and len(todo_data.description) > 1000:
@@ -371,33 +431,20 @@ class TodoService:
             TodoValidationError: バリデーションエラー
         """
         # 少なくとも一つのフィールドが更新される必要がある
-        update_data = todo_data.model_dump(exclude_unset=True)
-        if not update_data:
+        if not todo_data.model_fields_set:
             raise TodoValidationError("At least one field must be provided for update")
         
         if todo_data.title is not None:
-            if not todo_data.title or not todo_data.title.strip():
+            stripped = todo_data.title.strip()
+            if not stripped:
                 raise TodoValidationError("Title cannot be empty or whitespace only")
             
-            if len(todo_data.title.strip()) > 200:
+            if len(stripped) > 200:
                 raise TodoValidationError("Title cannot exceed 200 characters")
         
         if todo_data.description is not None and len(todo_data.description) > 1000:
             raise TodoValidationError("Description cannot exceed 1000 characters")
     
-    def _validate_todo_id(self, todo_id: int) -> None:
-        """
-        ToDoアイテムIDのバリデーション
-        
-        Args:
-            todo_id (int): ToDoアイテムID
-            
-        Raises:
-            TodoValidationError: バリデーションエラー
-        """
-        if not isinstance(todo_id, int) or todo_id <= 0:
-            raise TodoValidationError("Todo ID must be a positive integer")
-    
     def _validate_pagination_params(self, skip: int, limit: int) -> None:
         """
         ページネーションパラメータのバリデーション
@@ -415,8 +462,8 @@ class TodoService:
         if not isinstance(limit, int) or limit <= 0:
             raise TodoValidationError("Limit parameter must be a positive integer")
         
-        if limit > 1000:
-            raise TodoValidationError("Limit parameter cannot exceed 1000")
+        if limit > MAX_PAGE_SIZE:
+            raise TodoValidationError(f"Limit parameter cannot exceed {MAX_PAGE_SIZE}")
     
     def _validate_search_params(self, search_params: TodoSearchParams) -> None:
         """
@@ -436,4 +483,19 @@ class TodoService:
             search_params.end_date_from > search_params.end_date_to):
             raise TodoValidationError("end_date_from must be before or equal to end_date_to")
         
-        logger.debug(f"Search parameters validated successfully: {search_params}")
\ No newline at end of file
+        logger.debug("Search parameters validated successfully: %s", search_params)
+
+
+def get_todo_service(db: Session = Depends(get_db)) -> TodoService:
+    """
+    TodoServiceを取得する依存関数
+    
+    FastAPIの依存性注入で使用され、リクエストごとのセッションに紐づくサービスを生成する。
+    
+    Args:
+        db (Session): データベースセッション
+        
+    Returns:
+        TodoService: ToDoサービス
+    """
+    return TodoService(db)
@@ -0,0 +1,102 @@
+"""
+ToDoアイテムのキャッシュ
+
+IDによるToDoアイテム取得結果をプロセス内にTTL付きでキャッシュする。
+作成・更新・削除時には該当IDのエントリを明示的に無効化する。
+
+同一プロセス内の読み取りと更新の競合（読み取り中に別リクエストが更新・削除して
+無効化した後、読み取り側が古い行を格納する）は世代番号で防ぐ。
+読み取り側はDB参照前にgeneration()で世代番号を取得してput()に渡し、
+その間に無効化が行われていた場合は格納しない。
+
+キャッシュしたTodoResponseは複製せず同じインスタンスを全リクエストで共有するため、
+呼び出し側は取得したインスタンスを変更してはならない（変更が必要な場合はmodel_copy()する）。
+
+注意: キャッシュはワーカープロセスごとに独立している。
+複数ワーカー構成では他ワーカーでの更新は無効化されないため、
+古いデータが返る期間はTTL（todo_cache_ttl秒）以内に限られる。
+"""
+import threading
+from typing import Optional
+
+from cachetools import TTLCache
+
+from app.config import settings
+from app.schemas.todo import TodoResponse
+
+# TTLCacheはスレッドセーフではないため、スレッドプールで実行されるハンドラーからの操作はロックで保護する
+cache: TTLCache = TTLCache(maxsize=settings.todo_cache_maxsize, ttl=settings.todo_cache_ttl)
+_lock = threading.Lock()
+# 無効化のたびに加算する世代番号（ID別に保持するとIDの数だけメモリが増えるため、全体で1つ）
+_generation = 0
+
+
+def get(todo_id: int) -> Optional[TodoResponse]:
+    """
+    キャッシュからToDoアイテムを取得する
+
+    Args:
+        todo_id (int): ToDoアイテムのID
+
+    Returns:
+        Optional[TodoResponse]: キャッシュされたToDoアイテム（存在しない場合はNone）。
+            共有インスタンスのため変更してはならない
+    """
+    with _lock:
+        return cache.get(todo_id)
+
+
+def generation() -> int:
+    """
+    現在の世代番号を取得する
+
+    DBからの読み取り前に取得し、読み取り結果をput()で格納する際に渡す。
+
+    Returns:
+        int: 現在の世代番号
+    """
+    with _lock:
+        return _generation
+
+
+def put(todo_id: int, todo: TodoResponse, generation: int) -> bool:
+    """
+    ToDoアイテムをキャッシュに格納する
+
+    読み取り開始後に無効化が行われていた場合（世代番号が変わっている場合）は、
+    読み取った内容が古い可能性があるため格納しない。
+
+    Args:
+        todo_id (int): ToDoアイテムのID
+        todo (TodoResponse): 格納するToDoアイテム（格納後は共有されるため変更してはならない）
+        generation (int): 読み取り開始前にgeneration()で取得した世代番号
+
+    Returns:
+        bool: 格納した場合はTrue
+    """
+    with _lock:
+        if generation != _generation:
+            return False
+        cache[todo_id] = todo
+        return True
+
+
+def invalidate(todo_id: int) -> None:
+    """
+    指定したIDのキャッシュエントリを無効化する
+
+    Args:
+        todo_id (int): ToDoアイテムのID
+    """
+    global _generation
+    with _lock:
+        _generation += 1
+        cache.pop(todo_id, None)
+
+
+def clear() -> None:
+    """すべてのキャッシュエントリを削除する"""
+    global _generation
+    with _lock:
+        _generation += 1
+        cache.clear()
@@ -4,51 +4,60 @@
 
 Alembicを使用してデータベースマイグレーションを実行する。
 """
-import subprocess
 import sys
 import os
 from pathlib import Path
+from typing import Callable
+
+from alembic import command
+from alembic.config import Config
 
 # プロジェクトルートを取得
 PROJECT_ROOT = Path(__file__).parent.parent
 os.chdir(PROJECT_ROOT)
 
+# Alembicの設定（プロセス内で共有し、コマンドごとにインタプリタを起動しない）
+ALEMBIC_CONFIG = Config(str(PROJECT_ROOT / "alembic.ini"))
+
 
-def run_command(command: list[str]) -> int:
-    """コマンドを実行し、結果を表示する"""
-    print(f"実行中: {' '.join(command)}")
-    result = subprocess.run(command, capture_output=False)
-    return result.returncode
+def run_alembic(func: Callable, *args, **kwargs) -> int:
+    """Alembicコマンドをプロセス内で実行し、終了コードを返す"""
+    try:
+        func(ALEMBIC_CONFIG, *args, **kwargs)
+        return 0
+    except Exception as e:
+        print(f"❌ マイグレーションコマンドが失敗しました: {e}")
+        return 1
 
 
 def migrate_up():
     """最新のマイグレーションまで適用する"""
     print("🔄 データベースマイグレーションを実行中...")
-    return run_command(["alembic", "upgrade", "head"])
+    return run_alembic(command.upgrade, "head")
 
 
 def migrate_down(revision: str = "-1"):
     """指定されたリビジョンまでダウングレードする"""
     print(f"⬇️  データベースを {revision} までダウングレード中...")
-    return run_command(["alembic", "downgrade", revision])
+    return run_alembic(command.downgrade, revision)
 
 
 def create_migration(message: str):
     """新しいマイグレーションを作成する"""
     print(f"📝 新しいマイグレーション '{message}' を作成中...")
-    return run_command(["alembic", "revision", "--autogenerate", "-m", message])
+    return run_alembic(command.revision, message=message, autogenerate=True)
 
 
 def show_current():
     """現在のマイグレーション状態を表示する"""
     print("📊 現在のマイグレーション状態:")
-    return run_command(["alembic", "current"])
+    return run_alembic(command.current)
 
 
 def show_history():
     """マイグレーション履歴を表示する"""
     print("📜 マイグレーション履歴:")
-    return run_command(["alembic", "history", "--verbose"])
+    return run_alembic(command.history, verbose=True)
 
 
 def main():
@@ -62,25 +71,25 @@ def main():
         print("  python scripts/db_migrate.py history               # 履歴表示")
         sys.exit(1)
 
-    command = sys.argv[1]
+    action = sys.argv[1]
     
-    if command == "up":
+    if action == "up":
         exit_code = migrate_up()
-    elif command == "down":
+    elif action == "down":
         revision = sys.argv[2] if len(sys.argv) > 2 else "-1"
         exit_code = migrate_down(revision)
-    elif command == "create":
+    elif action == "create":
         if len(sys.argv) < 3:
             print("エラー: マイグレーションメッセージが必要です")
             sys.exit(1)
         message = " ".join(sys.argv[2:])
         exit_code = create_migration(message)
-    elif command == "current":
+    elif action == "current":
         exit_code = show_current()
-    elif command == "history":
+    elif action == "history":
         exit_code = show_history()
     else:
-        print(f"エラー: 不明なコマンド '{command}'")
+        print(f"エラー: 不明なコマンド '{action}'")
         sys.exit(1)
     
     sys.exit(exit_code)
@@ -15,6 +15,8 @@ sys.path.append(str(PROJECT_ROOT))
 
 from app.database import engine, Base, SessionLocal
 from app.models.todo import Todo
+from app.repositories.todo import TodoRepository
+from sqlalchemy import exists, insert, literal, select, union_all
 from sqlalchemy.orm import Session
 
 
@@ -31,73 +33,85 @@ def create_sample_data():
     
     db: Session = SessionLocal()
     try:
-        # 既存のデータをチェック
-        existing_count = db.query(Todo).count()
-        if existing_count > 0:
-            print(f"⚠️  既に {existing_count} 件のデータが存在します。スキップします。")
-            return
-        
-        # サンプルデータ
+        # サンプルデータ（各行は同じ列集合を持つようにend_dateを省略しない）
+        now = datetime.now(timezone.utc)
         sample_todos = [
-            Todo(
-                title="プロジェクトの企画書を作成",
-                description="新しいWebアプリケーションの企画書を作成する。要件定義、技術選定、スケジュールを含める。",
-                completed=False,
-                end_date=datetime.now(timezone.utc) + timedelta(days=7)
-            ),
-            Todo(
-                title="データベース設計",
-                description="ユーザー管理とタスク管理のためのデータベーススキーマを設計する。",
-                completed=True,
-                end_date=datetime.now(timezone.utc) - timedelta(days=2)
-            ),
-            Todo(
-                title="API仕様書の作成",
-                description="RESTful APIの仕様書をOpenAPI形式で作成する。",
-                completed=False,
-                end_date=datetime.now(timezone.utc) + timedelta(days=3)
-            ),
-            Todo(
-                title="フロントエンド開発環境構築",
-                description="React + TypeScriptの開発環境をセットアップする。",
-                completed=False
-            ),
-            Todo(
-                title="ユニットテストの作成",
-                description="APIエンドポイントのユニットテストを作成する。カバレッジ80%以上を目標とする。",
-                completed=False,
-                end_date=datetime.now(timezone.utc) + timedelta(days=10)
-            ),
-            Todo(
-                title="コードレビューの実施",
-                description="チームメンバーのコードレビューを実施し、品質向上を図る。",
-                completed=True,
-                end_date=datetime.now(timezone.utc) - timedelta(days=1)
-            ),
-            Todo(
-                title="デプロイメント自動化",
-                description="CI/CDパイプラインを構築し、自動デプロイメントを実現する。",
-                completed=False,
-                end_date=datetime.now(timezone.utc) + timedelta(days=14)
-            ),
-            Todo(
-                title="パフォーマンステスト",
-                description="アプリケーションの負荷テストを実施し、パフォーマンスを測定する。",
-                completed=False,
-                end_date=datetime.now(timezone.utc) + timedelta(days=21)
-            )
+            {
+                "title": "プロジェクトの企画書を作成",
+                "description": "新しいWebアプリケーションの企画書を作成する。要件定義、技術選定、スケジュールを含める。",
+                "completed": False,
+                "end_date": now + timedelta(days=7)
+            },
+            {
+                "title": "データベース設計",
+                "description": "ユーザー管理とタスク管理のためのデータベーススキーマを設計する。",
+                "completed": True,
+                "end_date": now - timedelta(days=2)
+            },
+            {
+                "title": "API仕様書の作成",
+                "description": "RESTful APIの仕様書をOpenAPI形式で作成する。",
+                "completed": False,
+                "end_date": now + timedelta(days=3)
+            },
+            {
+                "title": "フロントエンド開発環境構築",
+                "description": "React + TypeScriptの開発環境をセットアップする。",
+                "completed": False,
+                "end_date": None
+            },
+            {
+                "title": "ユニットテストの作成",
+                "description": "APIエンドポイントのユニットテストを作成する。カバレッジ80%以上を目標とする。",
+                "completed": False,
+                "end_date": now + timedelta(days=10)
+            },
+            {
+                "title": "コードレビューの実施",
+                "description": "チームメンバーのコードレビューを実施し、品質向上を図る。",
+                "completed": True,
+                "end_date": now - timedelta(days=1)
+            },
+            {
+                "title": "デプロイメント自動化",
+                "description": "CI/CDパイプラインを構築し、自動デプロイメントを実現する。",
+                "completed": False,
+                "end_date": now + timedelta(days=14)
+            },
+            {
+                "title": "パフォーマンステスト",
+                "description": "アプリケーションの負荷テストを実施し、パフォーマンスを測定する。",
+                "completed": False,
+                "end_date": now + timedelta(days=21)
+            }
         ]
         
-        # データベースに追加
-        for todo in sample_todos:
-            db.add(todo)
-        
+        # テーブルが空の場合のみ挿入する INSERT ... SELECT ... WHERE NOT EXISTS を1回で実行する
+        # 件数確認と挿入を1文にまとめ、往復回数と他プロセスが割り込む余地を減らす
+        # （VALUES句の列別名はSQLiteで使えないため、行ごとのSELECTをUNION ALLで連結する）
+        seed_columns = ["title", "description", "completed", "end_date"]
+        seed_rows = union_all(*(
+            select(*(
+                literal(row[name], Todo.__table__.c[name].type).label(name)
+                for name in seed_columns
+            ))
+            for row in sample_todos
+        )).subquery("sample_todos")
+        stmt = insert(Todo).from_select(
+            seed_columns,
+            select(seed_rows).where(~exists().select_from(Todo))
+        )
+        inserted = db.execute(stmt).rowcount
         db.commit()
-        print(f"✅ {len(sample_todos)} 件のサンプルデータを作成しました")
+        
+        if not inserted:
+            print("⚠️  既にデータが存在します。スキップします。")
+            return
+        print(f"✅ {inserted} 件のサンプルデータを作成しました")
         
         # 作成されたデータの確認
-        total_count = db.query(Todo).count()
-        completed_count = db.query(Todo).filter(Todo.completed == True).count()
+        # 総数と完了数は条件付き集計の1回のクエリで取得する
+        total_count, completed_count = TodoRepository(db).get_stats()
         pending_count = total_count - completed_count
         
         print(f"📊 データベース統計:")
@@ -0,0 +1,40 @@
+"""
+テストデータの共通定義
+
+複数のテストモジュール・フィクスチャで共有する静的なテストデータを定義する。
+共有されるため、すべて読み取り専用のマッピングとして提供する。
+test_config.pyを単体で実行できるよう、appパッケージには依存しない
+（最大長がスキーマと一致することはtest_todo_api.pyで検証する）。
+"""
+from types import MappingProxyType
+
+# スキーマのタイトル・説明の最大長（app.schemas.todoの同名定数と同じ値）
+TITLE_MAX_LENGTH = 200
+DESCRIPTION_MAX_LENGTH = 1000
+
+
+# バリデーションエラーテスト用の無効なToDoデータサンプル
+INVALID_TODO_DATA = MappingProxyType({
+    name: MappingProxyType(data)
+    for name, data in {
+        "empty_title": {
+            "title": "",
+            "description": "空のタイトル"
+        },
+        "title_too_long": {
+            "title": "a" * (TITLE_MAX_LENGTH + 1),
+            "description": "長すぎるタイトル"
+        },
+        "description_too_long": {
+            "title": "正常なタイトル",
+            "description": "a" * (DESCRIPTION_MAX_LENGTH + 1)
+        },
+        "missing_title": {
+            "description": "タイトルが欠けている"
+        },
+        "invalid_completed_type": {
+            "title": "正常なタイトル",
+            "completed": "invalid"
+        }
+    }.items()
+})
@@ -5,41 +5,90 @@ pytestのフィクスチャとテスト用データベース設定を提供す
 統合テスト用のテストクライアントとデータベース設定も含む。
 """
 import pytest
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import event, insert
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
-from typing import Generator
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Generator, Iterator
 import os
-from fastapi.testclient import TestClient
+import sys
 
-# テスト環境用の環境変数を設定
-os.environ["DATABASE_URL"] = "sqlite:///:memory:"
-os.environ["TESTING"] = "true"
-
-from app.database import Base, get_db
-from app.models.todo import Todo
-from app.repositories.todo import TodoRepository
-from app.main import app
+# appパッケージは設定（環境変数）をインポート時に読み込むため、このモジュールでは
+# インポートせず、使用するフィクスチャ内でインポートする（pytest_configureの後になる）
+# FastAPIアプリ・サービス層・リポジトリ層を使わないテストはそのインポートコストも払わない
+if TYPE_CHECKING:
+    from app.models.todo import Todo
+    from app.repositories.todo import TodoRepository
 
 
 # テスト用データベースURL（SQLiteインメモリ）
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
 
+def pytest_configure(config):
+    """
+    テスト環境用の環境変数を設定する
+    
+    テストモジュールの収集（appパッケージのインポート）より前に1回だけ呼ばれる。
+    DATABASE_URLは開発者の環境に本番・開発用DBが設定されていても
+    テストが接続しないよう、常にインメモリSQLiteで上書きする。
+    """
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+    os.environ.setdefault("TESTING", "true")
+    
+    # 複数ステップのエンドツーエンドテスト（pytest -m "not integration" で除外できる）
+    config.addinivalue_line("markers", "integration: slow multi-step end-to-end API tests")
+
+
+def _freeze(data: Any) -> Any:
+    """
+    セッションスコープで共有するテストデータを読み取り専用にする
+    
+    dictはMappingProxyType、listはtupleに再帰的に変換し、
+    テスト間で共有されるデータが書き換えられないようにする。
+    """
+    if isinstance(data, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in data.items()})
+    if isinstance(data, list):
+        return tuple(_freeze(item) for item in data)
+    return data
+
+
+@pytest.fixture(autouse=True)
+def clear_todo_cache():
+    """
+    テストごとにToDoキャッシュをクリアする
+    
+    テストごとにデータベースが作り直されIDが再利用されるため、
+    前のテストのキャッシュエントリが残らないようにする。
+    """
+    _clear_todo_cache()
+    yield
+    _clear_todo_cache()
+
+
+def _clear_todo_cache() -> None:
+    """キャッシュモジュールがインポート済みの場合のみToDoキャッシュをクリアする"""
+    # 未インポートであればキャッシュは空のため、クリアのためだけにサービス層を読み込まない
+    todo_cache = sys.modules.get("app.services.todo_cache")
+    if todo_cache is not None:
+        todo_cache.clear()
+
+
 @pytest.fixture(scope="session")
 def test_engine():
     """
     テスト用データベースエンジンを作成する
     
+    単体テストと統合テストで共有し、テーブル作成はセッション全体で1回のみ行う。
+    
     Returns:
         Engine: テスト用SQLAlchemyエンジン
     """
-    engine = create_engine(
-        TEST_DATABASE_URL,
-        poolclass=StaticPool,
-        connect_args={"check_same_thread": False},
-        echo=False  # テスト時はSQLログを無効化
-    )
+    from app.database import Base
+    from tests.test_database import create_test_engine
+    
+    engine = create_test_engine(TEST_DATABASE_URL)
     
     # テーブル作成
     Base.metadata.create_all(bind=engine)
@@ -50,6 +99,42 @@ def test_engine():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def count_queries(test_engine):
+    """
+    ブロック内で発行されたSQL文を記録するコンテキストマネージャーを提供する
+
+    N+1クエリなどの発行回数の退行を検出するために使う。
+    テスト用トランザクションのSAVEPOINT操作は数えない。
+
+    Args:
+        test_engine: テスト用データベースエンジン
+
+    Returns:
+        Callable: 呼び出すと記録したSQL文のリストを返すコンテキストマネージャー
+
+    Example:
+        with count_queries() as queries:
+            todo_repository.get_all()
+        assert len(queries) == 1
+    """
+    @contextmanager
+    def _count_queries() -> Iterator[list[str]]:
+        queries: list[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if not statement.startswith(("SAVEPOINT", "RELEASE", "ROLLBACK")):
+                queries.append(statement)
+
+        event.listen(test_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield queries
+        finally:
+            event.remove(test_engine, "before_cursor_execute", before_cursor_execute)
+
+    return _count_queries
+
+
 @pytest.fixture(scope="function")
 def test_db_session(test_engine) -> Generator[Session, None, None]:
     """
@@ -57,17 +142,20 @@ def test_db_session(test_engine) -> Generator[Session, None, None]:
     
     各テスト関数ごとに新しいセッションを作成し、
     テスト終了後にロールバックする。
-    
+    リポジトリ内のcommit・rollbackはSAVEPOINTに対して行われるため、
+    外側のトランザクションは終了せず、テスト間でデータが残らない。
+
     Args:
         test_engine: テスト用データベースエンジン
-        
+
     Yields:
         Session: テスト用データベースセッション
     """
     TestSessionLocal = sessionmaker(
         autocommit=False,
         autoflush=False,
-        bind=test_engine
+        bind=test_engine,
+        join_transaction_mode="create_savepoint"
     )
     
     # トランザクションを開始
@@ -86,7 +174,7 @@ def test_db_session(test_engine) -> Generator[Session, None, None]:
 
 
 @pytest.fixture
-def todo_repository(test_db_session: Session) -> TodoRepository:
+def todo_repository(test_db_session: Session) -> "TodoRepository":
     """
     テスト用TodoRepositoryインスタンスを作成する
     
@@ -96,33 +184,38 @@ def todo_repository(test_db_session: Session) -> TodoRepository:
     Returns:
         TodoRepository: テスト用リポジトリインスタンス
     """
+    from app.repositories.todo import TodoRepository
     return TodoRepository(test_db_session)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_todo_data():
     """
     テスト用のサンプルToDoデータを提供する
     
+    セッション全体で共有するため、読み取り専用のマッピングとして返す。
+    
     Returns:
-        dict: サンプルToDoデータ
+        Mapping: サンプルToDoデータ
     """
-    return {
+    return _freeze({
         "title": "テストタスク",
         "description": "これはテスト用のタスクです",
         "completed": False
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_todo_data_list():
     """
     テスト用の複数のサンプルToDoデータを提供する
     
+    セッション全体で共有するため、読み取り専用のマッピングのタプルとして返す。
+    
     Returns:
-        list: サンプルToDoデータのリスト
+        tuple: サンプルToDoデータのタプル
     """
-    return [
+    return _freeze([
         {
             "title": "タスク1",
             "description": "最初のタスク",
@@ -138,11 +231,11 @@ def sample_todo_data_list():
             "description": "3番目のタスク",
             "completed": False
         }
-    ]
+    ])
 
 
 @pytest.fixture
-def created_todo(todo_repository: TodoRepository, sample_todo_data) -> Todo:
+def created_todo(todo_repository: "TodoRepository", sample_todo_data) -> "Todo":
     """
     テスト用に作成済みのToDoアイテムを提供する
     
@@ -159,27 +252,40 @@ def created_todo(todo_repository: TodoRepository, sample_todo_data) -> Todo:
     return todo_repository.create(todo_create)
 
 
+def _bulk_create_todos(session: Session, todo_data_list) -> list["Todo"]:
+    """
+    ToDoアイテムを1回のINSERT（RETURNING付き）でまとめて作成する
+    
+    Args:
+        session: データベースセッション
+        todo_data_list: 作成するToDoデータのシーケンス
+        
+    Returns:
+        list[Todo]: 作成済みのToDoアイテムのリスト（入力と同じ順序）
+    """
+    from app.models.todo import Todo
+    
+    todos = session.scalars(
+        insert(Todo).returning(Todo, sort_by_parameter_order=True),
+        [dict(todo_data) for todo_data in todo_data_list]
+    ).all()
+    session.commit()
+    return list(todos)
+
+
 @pytest.fixture
-def created_todos(todo_repository: TodoRepository, sample_todo_data_list) -> list[Todo]:
+def created_todos(test_db_session: Session, sample_todo_data_list) -> list["Todo"]:
     """
     テスト用に作成済みの複数のToDoアイテムを提供する
     
     Args:
-        todo_repository: TodoRepositoryインスタンス
+        test_db_session: テスト用データベースセッション
         sample_todo_data_list: サンプルToDoデータのリスト
         
     Returns:
         list[Todo]: 作成済みのToDoアイテムのリスト
     """
-    from app.schemas.todo import TodoCreate
-    
-    todos = []
-    for todo_data in sample_todo_data_list:
-        todo_create = TodoCreate(**todo_data)
-        todo = todo_repository.create(todo_create)
-        todos.append(todo)
-    
-    return todos
+    return _bulk_create_todos(test_db_session, sample_todo_data_list)
 
 
 @pytest.fixture
@@ -199,110 +305,106 @@ def todo_service(test_db_session: Session):
 
 # 統合テスト用のフィクスチャ
 
-@pytest.fixture(scope="session")
-def integration_test_engine():
-    """
-    統合テスト用データベースエンジンを作成する
-    
-    Returns:
-        Engine: 統合テスト用SQLAlchemyエンジン
+@pytest.fixture(scope="function")
+def integration_test_session(test_engine) -> Generator[Session, None, None]:
     """
-    engine = create_engine(
-        TEST_DATABASE_URL,
-        poolclass=StaticPool,
-        connect_args={"check_same_thread": False},
-        echo=False
-    )
-    
-    # テーブル作成
-    Base.metadata.create_all(bind=engine)
+    統合テスト用データベースセッションを作成する
     
-    yield engine
-    
-    # テスト終了後のクリーンアップ
-    Base.metadata.drop_all(bind=engine)
-
-
-@pytest.fixture(scope="session")
-def integration_test_session_factory(integration_test_engine):
-    """
-    統合テスト用セッションファクトリを作成する
+    テストごとに外側のトランザクションを開始し、セッションをその接続にバインドする。
+    エンドポイント内のcommit/rollbackはSAVEPOINTに対して行われるため外側には漏れず、
+    テスト終了時のROLLBACK1回でデータが元に戻る。
     
     Args:
-        integration_test_engine: 統合テスト用データベースエンジン
+        test_engine: テスト用データベースエンジン
         
-    Returns:
-        sessionmaker: セッションファクトリ
+    Yields:
+        Session: 統合テスト用データベースセッション
     """
-    return sessionmaker(
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    
+    # アプリのSessionLocalと同じ設定で、コミットをSAVEPOINTのRELEASEにする
+    session = sessionmaker(
         autocommit=False,
         autoflush=False,
-        bind=integration_test_engine
-    )
+        expire_on_commit=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint"
+    )()
+    
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
 
 
-def override_get_db_for_integration_tests(session_factory):
+def override_get_db_for_integration_tests(session: Session):
     """
     統合テスト用のデータベース依存関係オーバーライド関数を作成する
     
     Args:
-        session_factory: セッションファクトリ
+        session: テストのトランザクションにバインドされたセッション
         
     Returns:
         function: データベースセッションを提供する関数
     """
     def _override_get_db():
         try:
-            db = session_factory()
-            yield db
+            yield session
+        except Exception:
+            session.rollback()
+            raise
         finally:
-            db.close()
+            # リクエストごとに識別マップを破棄する（外側のトランザクションは維持される）
+            session.close()
     
     return _override_get_db
 
 
 @pytest.fixture(scope="session")
-def integration_test_client(integration_test_session_factory):
+def integration_test_app_client():
     """
-    統合テスト用FastAPIテストクライアントを作成する
+    統合テスト用FastAPIテストクライアントを作成する（lifespanはセッション全体で1回）
     
-    Args:
-        integration_test_session_factory: セッションファクトリ
-        
     Returns:
         TestClient: FastAPIテストクライアント
     """
-    # データベース依存関係をオーバーライド
-    app.dependency_overrides[get_db] = override_get_db_for_integration_tests(
-        integration_test_session_factory
-    )
+    from fastapi.testclient import TestClient
+    from app.main import app
     
     with TestClient(app) as client:
         yield client
-    
-    # オーバーライドをクリア
-    app.dependency_overrides.clear()
 
 
-@pytest.fixture(autouse=True, scope="function")
-def clean_integration_test_database(integration_test_session_factory):
+@pytest.fixture(scope="function")
+def integration_test_client(integration_test_app_client, integration_test_session):
     """
-    各統合テスト前後でデータベースをクリーンアップする
+    テストのセッションを使う統合テスト用FastAPIテストクライアントを提供する
     
     Args:
-        integration_test_session_factory: セッションファクトリ
+        integration_test_app_client: FastAPIテストクライアント
+        integration_test_session: 統合テスト用データベースセッション
+        
+    Yields:
+        TestClient: FastAPIテストクライアント
     """
-    # テスト前: データをクリーンアップ
-    with integration_test_session_factory() as db:
-        db.query(Todo).delete()
-        db.commit()
+    from app.database import get_db
+    from app.main import app
     
-    yield
+    # データベース依存関係をオーバーライドし、テスト後に元のオーバーライドへ戻す
+    previous_override = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db_for_integration_tests(
+        integration_test_session
+    )
+    
+    yield integration_test_app_client
     
-    # テスト後: データをクリーンアップ
-    with integration_test_session_factory() as db:
-        db.query(Todo).delete()
-        db.commit()
+    if previous_override is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous_override
 
 
 @pytest.fixture
@@ -348,128 +450,105 @@ def integration_test_multiple_todo_data():
 
 
 @pytest.fixture
-def created_integration_test_todo(integration_test_client, integration_test_todo_data):
+def seed_integration_todos(integration_test_session: Session):
     """
-    統合テスト用に作成済みのToDoアイテムを提供する
+    統合テスト用のデータをAPIを経由せずにデータベースへ直接投入する関数を提供する
+    
+    HTTPの挙動を検証しないテストの前提データ作成に使う。
+    入力はAPIと同じくTodoCreateで検証し、1回のINSERTでまとめて作成する。
     
     Args:
-        integration_test_client: FastAPIテストクライアント
-        integration_test_todo_data: サンプルToDoデータ
+        integration_test_session: 統合テスト用データベースセッション
         
     Returns:
-        dict: 作成済みのToDoアイテムのレスポンスデータ
+        function: ToDoデータのリストを受け取り、APIレスポンスと同じ形式の辞書のリストを返す関数
     """
-    response = integration_test_client.post("/todos/", json=integration_test_todo_data)
-    assert response.status_code == 201
-    return response.json()
+    from app.schemas.todo import TodoCreate, TodoResponse
+    
+    def _seed(todo_data_list) -> list[dict]:
+        todos = _bulk_create_todos(
+            integration_test_session,
+            [TodoCreate(**todo_data).model_dump() for todo_data in todo_data_list]
+        )
+        return [TodoResponse.model_validate(todo).model_dump(mode="json") for todo in todos]
+    
+    return _seed
 
 
 @pytest.fixture
-def created_integration_test_todos(integration_test_client, integration_test_multiple_todo_data):
+def created_integration_test_todo(seed_integration_todos, integration_test_todo_data):
     """
-    統合テスト用に作成済みの複数のToDoアイテムを提供する
+    統合テスト用に作成済みのToDoアイテムを提供する
     
     Args:
-        integration_test_client: FastAPIテストクライアント
-        integration_test_multiple_todo_data: 複数のサンプルToDoデータ
+        seed_integration_todos: 統合テスト用データの投入関数
+        integration_test_todo_data: サンプルToDoデータ
         
     Returns:
-        list: 作成済みのToDoアイテムのレスポンスデータのリスト
-    """
-    created_todos = []
-    for todo_data in integration_test_multiple_todo_data:
-        response = integration_test_client.post("/todos/", json=todo_data)
-        assert response.status_code == 201
-        created_todos.append(response.json())
-    
-    return created_todos
-
-
-# テストデータベース設定用のヘルパー関数
-
-def setup_test_database():
-    """
-    テスト用データベースをセットアップする
-    
-    Returns:
-        tuple: (engine, session_factory)
+        dict: 作成済みのToDoアイテム（APIレスポンスと同じ形式）
     """
-    engine = create_engine(
-        TEST_DATABASE_URL,
-        poolclass=StaticPool,
-        connect_args={"check_same_thread": False},
-        echo=False
-    )
-    
-    Base.metadata.create_all(bind=engine)
-    
-    session_factory = sessionmaker(
-        autocommit=False,
-        autoflush=False,
-        bind=engine
-    )
-    
-    return engine, session_factory
+    return seed_integration_todos([integration_test_todo_data])[0]
 
 
-def teardown_test_database(engine):
+@pytest.fixture
+def created_integration_test_todos(seed_integration_todos, integration_test_multiple_todo_data):
     """
-    テスト用データベースをクリーンアップする
+    統合テスト用に作成済みの複数のToDoアイテムを提供する
     
     Args:
-        engine: データベースエンジン
+        seed_integration_todos: 統合テスト用データの投入関数
+        integration_test_multiple_todo_data: 複数のサンプルToDoデータ
+        
+    Returns:
+        list: 作成済みのToDoアイテム（APIレスポンスと同じ形式）のリスト
     """
-    Base.metadata.drop_all(bind=engine)
+    return seed_integration_todos(integration_test_multiple_todo_data)
 
 
 # パフォーマンステスト用のフィクスチャ
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def performance_test_data():
     """
-    パフォーマンステスト用の大量データを生成する
+    パフォーマンステスト用の大量データを生成する（セッションで1回のみ）
     
     Returns:
-        list: 大量のToDoデータ
+        tuple: 大量のToDoデータ（読み取り専用）
     """
-    return [
+    return _freeze([
         {
             "title": f"パフォーマンステストタスク{i+1}",
             "description": f"これは{i+1}番目のパフォーマンステスト用タスクです",
             "completed": i % 2 == 0  # 偶数番目は完了済み
         }
         for i in range(100)
-    ]
+    ])
+
+
+@pytest.fixture
+def created_performance_todos(test_db_session: Session, performance_test_data) -> list["Todo"]:
+    """
+    パフォーマンステスト用の大量データを作成済みの状態で提供する
+    
+    Args:
+        test_db_session: テスト用データベースセッション
+        performance_test_data: パフォーマンステスト用の大量データ
+        
+    Returns:
+        list[Todo]: 作成済みのToDoアイテムのリスト
+    """
+    return _bulk_create_todos(test_db_session, performance_test_data)
 
 
 # エラーテスト用のフィクスチャ
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def invalid_todo_data_samples():
     """
     バリデーションエラーテスト用の無効なToDoデータサンプルを提供する
     
     Returns:
-        dict: 無効なデータのサンプル集
+        Mapping: 無効なデータのサンプル集（読み取り専用）
     """
-    return {
-        "empty_title": {
-            "title": "",
-            "description": "空のタイトル"
-        },
-        "title_too_long": {
-            "title": "a" * 201,
-            "description": "長すぎるタイトル"
-        },
-        "description_too_long": {
-            "title": "正常なタイトル",
-            "description": "a" * 1001
-        },
-        "missing_title": {
-            "description": "タイトルが欠けている"
-        },
-        "invalid_completed_type": {
-            "title": "正常なタイトル",
-            "completed": "invalid"
-        }
-    }
\ No newline at end of file
+    from tests._data import INVALID_TODO_DATA
+    return INVALID_TODO_DATA
@@ -6,6 +6,12 @@
 import os
 from typing import Dict, Any
 
+try:
+    from tests import _data
+except ModuleNotFoundError:
+    # 単体実行時（python tests/test_config.py）はtestsパッケージが見つからないため、同じディレクトリから読み込む
+    import _data
+
 
 class TestConfig:
     """テスト環境設定クラス"""
@@ -141,24 +147,8 @@ class TestDataConfig:
         }
     ]
 
-    # バリデーションエラー用データ
-    INVALID_TODO_DATA = {
-        "empty_title": {
-            "title": "",
-            "description": "空のタイトル"
-        },
-        "title_too_long": {
-            "title": "a" * 201,
-            "description": "長すぎるタイトル"
-        },
-        "description_too_long": {
-            "title": "正常なタイトル",
-            "description": "a" * 1001
-        },
-        "missing_title": {
-            "description": "タイトルが欠けている"
-        }
-    }
+    # バリデーションエラー用データ（tests/_data.pyの共有データ）
+    INVALID_TODO_DATA = _data.INVALID_TODO_DATA
 
     # パフォーマンステスト用データ生成
     @classmethod
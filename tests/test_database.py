@@ -6,57 +6,83 @@
 import os
 import tempfile
 from contextlib import contextmanager
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
-from typing import Generator, Optional
+from typing import Generator, Iterator, Mapping, Optional, Union
 
 from app.database import Base
 from app.models.todo import Todo
+from tests._data import INVALID_TODO_DATA
+
+
+def create_test_engine(database_url: Optional[str] = None) -> Engine:
+    """
+    テスト用データベースエンジンを作成する
+    
+    テストで使うエンジンはすべてこの関数で作成する。
+    SQLiteではSAVEPOINTによるテストごとのロールバックが使えるよう、
+    pysqliteのトランザクション制御を無効化してBEGINをSQLAlchemyから発行させる。
+    
+    Args:
+        database_url: データベースURL（指定しない場合はインメモリSQLite）
+        
+    Returns:
+        Engine: テスト用SQLAlchemyエンジン
+    """
+    database_url = database_url or "sqlite:///:memory:"
+    if not database_url.startswith("sqlite"):
+        # PostgreSQL用の設定
+        return create_engine(database_url, echo=False)
+    
+    engine = create_engine(
+        database_url,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+        echo=False  # テスト時はSQLログを無効化
+    )
+    
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite_connection(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        # SQLiteでFOREIGN KEYを有効化
+        cursor.execute("PRAGMA foreign_keys=ON")
+        # テストデータは使い捨てのため、ジャーナルと同期書き込み（fsync）を省略する
+        # （インメモリDBでは元々発生しないが、一時ファイルのDBでコミットが速くなる）
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+    
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
+    return engine
 
 
 class TestDatabaseManager:
     """テストデータベース管理クラス"""
     
-    def __init__(self, database_url: Optional[str] = None):
+    def __init__(self, database_url: Optional[str] = None, engine: Optional[Engine] = None):
         """
         テストデータベースマネージャーを初期化する
         
         Args:
             database_url: データベースURL（指定しない場合はインメモリSQLite）
+            engine: 共有する作成済みのエンジン（指定した場合はdatabase_urlより優先し、
+                close()で破棄しない）
         """
-        self.database_url = database_url or "sqlite:///:memory:"
-        self.engine = None
-        self.session_factory = None
-        self._setup_engine()
-    
-    def _setup_engine(self):
-        """データベースエンジンをセットアップする"""
-        if self.database_url.startswith("sqlite"):
-            # SQLite用の設定
-            self.engine = create_engine(
-                self.database_url,
-                poolclass=StaticPool,
-                connect_args={"check_same_thread": False},
-                echo=False
-            )
-            
-            # SQLiteでFOREIGN KEYを有効化
-            @event.listens_for(self.engine, "connect")
-            def set_sqlite_pragma(dbapi_connection, connection_record):
-                cursor = dbapi_connection.cursor()
-                cursor.execute("PRAGMA foreign_keys=ON")
-                cursor.close()
-        else:
-            # PostgreSQL用の設定
-            self.engine = create_engine(
-                self.database_url,
-                echo=False
-            )
-        
+        self._owns_engine = engine is None
+        self.engine = engine or create_test_engine(database_url)
+        self.database_url = self.engine.url.render_as_string(hide_password=False)
+        # アプリのSessionLocalと同様に、セッション終了後も取得したオブジェクトの属性を参照できるようにする
         self.session_factory = sessionmaker(
             autocommit=False,
             autoflush=False,
+            expire_on_commit=False,
             bind=self.engine
         )
     
@@ -92,11 +118,11 @@ class TestDatabaseManager:
             session.close()
     
     def clear_all_data(self):
-        """全てのデータをクリアする"""
-        with self.get_session() as session:
-            # 外部キー制約を考慮してテーブルの順序で削除
-            session.query(Todo).delete()
-            session.commit()
+        """全てのデータをクリアする（ORMを介さずCoreのDELETEを直接発行する）"""
+        with self.engine.begin() as conn:
+            # 外部キー制約を考慮して依存する側のテーブルから削除
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
     
     def insert_test_data(self, test_data: list):
         """
@@ -105,26 +131,35 @@ class TestDatabaseManager:
         Args:
             test_data: 挿入するテストデータのリスト
         """
+        # 辞書形式のデータは1回のexecutemanyでまとめて挿入する
+        mappings = [data for data in test_data if isinstance(data, dict)]
+        # 既にモデルオブジェクトの場合はセッションに追加する
+        models = [data for data in test_data if not isinstance(data, dict)]
+        
         with self.get_session() as session:
-            for data in test_data:
-                if isinstance(data, dict):
-                    # 辞書形式のデータからTodoオブジェクトを作成
-                    todo = Todo(**data)
-                    session.add(todo)
-                else:
-                    # 既にモデルオブジェクトの場合
-                    session.add(data)
-            session.commit()
+            if mappings:
+                session.execute(insert(Todo), mappings)
+            session.add_all(models)
     
-    def get_all_todos(self) -> list:
+    def get_all_todos(self, *, stream: bool = False) -> Union[list, Iterator[Todo]]:
         """
         全てのToDoアイテムを取得する
         
+        Args:
+            stream: Trueの場合は全件をリストに展開せず、一定件数ずつ読み込むイテレーターを返す
+        
         Returns:
-            list: ToDoアイテムのリスト
+            Union[list, Iterator[Todo]]: ToDoアイテムのリスト（stream=Trueの場合はイテレーター）
         """
+        if stream:
+            return self._stream_all_todos()
         with self.get_session() as session:
-            return session.query(Todo).all()
+            return session.scalars(select(Todo)).all()
+    
+    def _stream_all_todos(self, batch_size: int = 50) -> Iterator[Todo]:
+        """ToDoアイテムをbatch_size件ずつ読み込みながら返す（消費し終えるまでセッションを保持する）"""
+        with self.get_session() as session:
+            yield from session.scalars(select(Todo).execution_options(yield_per=batch_size))
     
     def count_todos(self) -> int:
         """
@@ -134,11 +169,11 @@ class TestDatabaseManager:
             int: ToDoアイテムの総数
         """
         with self.get_session() as session:
-            return session.query(Todo).count()
+            return session.scalar(select(func.count()).select_from(Todo))
     
     def close(self):
-        """データベース接続を閉じる"""
-        if self.engine:
+        """データベース接続を閉じる（外部から渡されたエンジンは破棄しない）"""
+        if self._owns_engine:
             self.engine.dispose()
 
 
@@ -189,19 +224,14 @@ class TestDataFactory:
         ]
     
     @staticmethod
-    def create_invalid_todo_data() -> dict:
+    def create_invalid_todo_data() -> Mapping:
         """
-        バリデーションエラー用の無効なToDoデータを作成する
+        バリデーションエラー用の無効なToDoデータを取得する
         
         Returns:
-            dict: 無効なToDoデータのサンプル
+            Mapping: 無効なToDoデータのサンプル（共有の読み取り専用データ）
         """
-        return {
-            "empty_title": {"title": "", "description": "空のタイトル"},
-            "title_too_long": {"title": "a" * 201, "description": "長すぎるタイトル"},
-            "description_too_long": {"title": "正常なタイトル", "description": "a" * 1001},
-            "missing_title": {"description": "タイトルが欠けている"},
-        }
+        return INVALID_TODO_DATA
     
     @staticmethod
     def create_performance_test_data(count: int = 100) -> list:
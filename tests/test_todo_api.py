@@ -5,10 +5,24 @@ ToDoアプリケーションAPI統合テスト
 テストクライアントを使用したエンドツーエンドテストを提供する。
 """
 import pytest
+import time
+from datetime import datetime, timezone
+from unittest.mock import Mock
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
 import json
 
+from app.database import get_db
+from app.exceptions import MAX_ECHO_BODY_BYTES
 from app.main import app
+from app.repositories.todo import TodoRepository
+from app.routers import health
+from app.routers import todo as todo_router
+from app.schemas.todo import DESCRIPTION_MAX_LENGTH, TITLE_MAX_LENGTH, encode_cursor
+from tests import _data
+from tests._data import INVALID_TODO_DATA
 
 
 class TestRootEndpoint:
@@ -40,6 +54,41 @@ class TestHealthEndpoint:
         assert data["database"] == "healthy"
         assert "message" in data
 
+    def test_health_check_does_not_leak_connections(self, integration_test_client, monkeypatch, tmp_path):
+        """繰り返しのヘルスチェックで接続がプールに返却されることのテスト"""
+        pooled_engine = create_engine(
+            f"sqlite:///{tmp_path / 'health.db'}", pool_size=2, max_overflow=0
+        )
+        monkeypatch.setattr(health, "engine", pooled_engine)
+        # キャッシュを無効化して毎回DBへ問い合わせる
+        monkeypatch.setattr(health, "_HEALTH_CACHE_TTL", 0.0)
+
+        try:
+            for _ in range(10):
+                response = integration_test_client.get("/health")
+                assert response.status_code == 200
+
+            assert pooled_engine.pool.checkedout() == 0
+        finally:
+            pooled_engine.dispose()
+
+    def test_detailed_health_check_probes_database_while_cached(self, integration_test_client, monkeypatch):
+        """キャッシュ有効期間中もデータベースの疎通を毎回確認することのテスト"""
+        cached_info = {"version": "PostgreSQL 16", "tables_initialized": True}
+        monkeypatch.setattr(health, "_detailed_cache", (time.monotonic(), cached_info))
+
+        response = integration_test_client.get("/health/detailed")
+        assert response.status_code == 200
+        assert response.json()["database"] == {"status": "connected", **cached_info}
+
+        # データベースに接続できない場合はキャッシュがあっても503を返す
+        broken_session = Mock(spec_set=Session)
+        broken_session.execute.side_effect = OperationalError("SELECT 1", {}, Exception("connection refused"))
+        monkeypatch.setitem(app.dependency_overrides, get_db, lambda: broken_session)
+
+        response = integration_test_client.get("/health/detailed")
+        assert response.status_code == 503
+
 
 class TestTodoEndpoints:
     """ToDoエンドポイントの統合テスト"""
@@ -77,40 +126,14 @@ class TestTodoEndpoints:
         assert data["description"] is None
         assert data["completed"] is False
     
-    def test_create_todo_validation_error_empty_title(self, integration_test_client):
-        """空のタイトルでのバリデーションエラーテスト"""
-        todo_data = {
-            "title": "",
-            "description": "説明"
-        }
-        
-        response = integration_test_client.post("/todos/", json=todo_data)
-        
-        assert response.status_code == 422
-        data = response.json()
-        assert "detail" in data
-    
-    def test_create_todo_validation_error_title_too_long(self, integration_test_client):
-        """長すぎるタイトルでのバリデーションエラーテスト"""
-        todo_data = {
-            "title": "a" * 201,  # 最大長を超える
-            "description": "説明"
-        }
-        
-        response = integration_test_client.post("/todos/", json=todo_data)
-        
-        assert response.status_code == 422
-        data = response.json()
-        assert "detail" in data
-    
-    def test_create_todo_validation_error_description_too_long(self, integration_test_client):
-        """長すぎる説明でのバリデーションエラーテスト"""
-        todo_data = {
-            "title": "タイトル",
-            "description": "a" * 1001  # 最大長を超える
-        }
-        
-        response = integration_test_client.post("/todos/", json=todo_data)
+    def test_shared_invalid_samples_match_schema_limits(self):
+        """共有テストデータの最大長がスキーマの最大長と一致することのテスト"""
+        assert (_data.TITLE_MAX_LENGTH, _data.DESCRIPTION_MAX_LENGTH) == (TITLE_MAX_LENGTH, DESCRIPTION_MAX_LENGTH)
+
+    @pytest.mark.parametrize("case", list(INVALID_TODO_DATA))
+    def test_create_todo_validation_error(self, integration_test_client, case):
+        """無効なデータ（空・長すぎるタイトル、長すぎる説明など）でのバリデーションエラーテスト"""
+        response = integration_test_client.post("/todos/", json=dict(INVALID_TODO_DATA[case]))
         
         assert response.status_code == 422
         data = response.json()
@@ -124,20 +147,14 @@ class TestTodoEndpoints:
         data = response.json()
         assert data == []
     
-    def test_get_todos_with_data(self, integration_test_client):
+    def test_get_todos_with_data(self, integration_test_client, seed_integration_todos):
         """データが存在する場合のToDoリスト取得テスト"""
         # テストデータを作成
-        todos_data = [
+        seed_integration_todos([
             {"title": "タスク1", "description": "説明1", "completed": False},
             {"title": "タスク2", "description": "説明2", "completed": True},
             {"title": "タスク3", "description": "説明3", "completed": False}
-        ]
-        
-        created_todos = []
-        for todo_data in todos_data:
-            response = integration_test_client.post("/todos/", json=todo_data)
-            assert response.status_code == 201
-            created_todos.append(response.json())
+        ])
         
         # 全ToDoアイテムを取得
         response = integration_test_client.get("/todos/")
@@ -147,16 +164,13 @@ class TestTodoEndpoints:
         assert len(data) == 3
         
         # 作成日時の降順でソートされていることを確認
-        for i in range(len(data) - 1):
-            assert data[i]["created_at"] >= data[i + 1]["created_at"]
+        created_ats = [todo["created_at"] for todo in data]
+        assert created_ats == sorted(created_ats, reverse=True)
     
-    def test_get_todos_with_pagination(self, integration_test_client):
+    def test_get_todos_with_pagination(self, integration_test_client, seed_integration_todos):
         """ページネーション付きToDoリスト取得テスト"""
         # テストデータを作成
-        for i in range(5):
-            todo_data = {"title": f"タスク{i+1}", "completed": False}
-            response = integration_test_client.post("/todos/", json=todo_data)
-            assert response.status_code == 201
+        seed_integration_todos([{"title": f"タスク{i+1}", "completed": False} for i in range(5)])
         
         # 最初のページを取得
         response = integration_test_client.get("/todos/?skip=0&limit=2")
@@ -183,6 +197,90 @@ class TestTodoEndpoints:
                 assert todo["id"] not in all_ids
                 all_ids.add(todo["id"])
     
+    def test_get_todos_total_count_header(self, integration_test_client, seed_integration_todos):
+        """総件数がX-Total-Countヘッダーで返されることのテスト"""
+        seed_integration_todos([{"title": f"タスク{i+1}"} for i in range(3)])
+        
+        response = integration_test_client.get("/todos/?skip=0&limit=2")
+        
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+        assert response.headers["X-Total-Count"] == "3"
+
+    def test_get_todos_cursor_pagination(self, integration_test_client, seed_integration_todos):
+        """X-Next-Cursorヘッダーを使ったカーソルページネーションのテスト"""
+        seed_integration_todos([{"title": f"タスク{i+1}"} for i in range(5)])
+
+        seen_ids = []
+        response = integration_test_client.get("/todos/?limit=2")
+        while True:
+            assert response.status_code == 200
+            seen_ids.extend(todo["id"] for todo in response.json())
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if not next_cursor:
+                break
+            response = integration_test_client.get(f"/todos/?limit=2&cursor={next_cursor}")
+
+        # 重複・取りこぼしなく全件を取得できる
+        assert len(seen_ids) == 5
+        assert len(set(seen_ids)) == 5
+
+    def test_get_todos_next_cursor_with_stale_estimate(
+        self, integration_test_client, seed_integration_todos, monkeypatch
+    ):
+        """概算件数が実際の件数より少ない場合でも次ページのカーソルが返されることのテスト"""
+        seed_integration_todos([{"title": f"タスク{i+1}"} for i in range(3)])
+        # 統計が古く、実際の3件より少ない概算件数が返る状況
+        monkeypatch.setattr(TodoRepository, "estimate_count_all", lambda self: 1)
+
+        response = integration_test_client.get("/todos/?limit=2")
+
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+        # 総件数は取得できた件数と後続の存在から補正される
+        assert response.headers["X-Total-Count"] == "3"
+        next_cursor = response.headers["X-Next-Cursor"]
+
+        response = integration_test_client.get(f"/todos/?limit=2&cursor={next_cursor}")
+
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_get_todos_executes_single_query(self, integration_test_client, seed_integration_todos, count_queries):
+        """一覧取得が1回のSQLで完結すること（N+1が発生しないこと）のテスト"""
+        seed_integration_todos([{"title": f"タスク{i+1}"} for i in range(3)])
+
+        with count_queries() as queries:
+            response = integration_test_client.get("/todos/?exact_total=true")
+
+        assert response.status_code == 200
+        assert len(response.json()) == 3
+        assert len(queries) == 1
+
+    def test_get_todos_invalid_cursor(self, integration_test_client):
+        """無効なカーソルでのバリデーションエラーテスト"""
+        response = integration_test_client.get("/todos/?cursor=invalid")
+        assert response.status_code == 422
+        # pydanticの検証エラー文字列（errors.pydantic.devのURLなど）を含めず固定のメッセージを返す
+        assert response.json()["detail"] == "Invalid cursor"
+
+        response = integration_test_client.get(f"/todos/?skip=1&cursor={encode_cursor(1, datetime.now(timezone.utc))}")
+        assert response.status_code == 422
+        assert response.json()["detail"] == "skip cannot be combined with cursor"
+
+    def test_internal_value_error_is_not_client_error(self, integration_test_client, monkeypatch):
+        """ハンドラー内部のValueErrorが422ではなく500として扱われることのテスト"""
+        def broken_etag(todos):
+            raise ValueError("internal error")
+
+        monkeypatch.setattr(todo_router, "_compute_etag", broken_etag)
+        client = TestClient(app, raise_server_exceptions=False)
+
+        response = client.get("/todos/")
+        assert response.status_code == 500
+        assert "internal error" not in response.text
+
     def test_get_todos_invalid_pagination_params(self, integration_test_client):
         """無効なページネーションパラメータのテスト"""
         # 負のskip
@@ -197,18 +295,12 @@ class TestTodoEndpoints:
         response = integration_test_client.get("/todos/?skip=0&limit=1001")
         assert response.status_code == 422
     
-    def test_get_todo_by_id_success(self, integration_test_client):
+    def test_get_todo_by_id_success(
+        self, integration_test_client, created_integration_test_todo, integration_test_todo_data
+    ):
         """特定ToDoアイテム取得の正常ケーステスト"""
-        # テストデータを作成
-        todo_data = {
-            "title": "テストタスク",
-            "description": "これはテスト用のタスクです",
-            "completed": False
-        }
-        
-        create_response = integration_test_client.post("/todos/", json=todo_data)
-        assert create_response.status_code == 201
-        created_todo = create_response.json()
+        todo_data = integration_test_todo_data
+        created_todo = created_integration_test_todo
         
         # 作成したToDoアイテムを取得
         response = integration_test_client.get(f"/todos/{created_todo['id']}")
@@ -219,7 +311,42 @@ class TestTodoEndpoints:
         assert data["title"] == todo_data["title"]
         assert data["description"] == todo_data["description"]
         assert data["completed"] == todo_data["completed"]
-    
+
+    def test_get_todo_by_id_etag_not_modified(self, integration_test_client):
+        """ETagが一致する場合に304が返され、内容が変わると200に戻ることのテスト"""
+        create_response = integration_test_client.post("/todos/", json={"title": "ETagテスト"})
+        todo_id = create_response.json()["id"]
+
+        response = integration_test_client.get(f"/todos/{todo_id}")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert "max-age" in response.headers["Cache-Control"]
+
+        response = integration_test_client.get(f"/todos/{todo_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        # ETagが一致しない場合は本文を返す
+        response = integration_test_client.get(f"/todos/{todo_id}", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+
+        # 同じ秒内に更新された場合もETagが変わり、古い内容を使い続けさせない
+        integration_test_client.put(f"/todos/{todo_id}", json={"title": "ETagテスト（更新）"})
+        response = integration_test_client.get(f"/todos/{todo_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["title"] == "ETagテスト（更新）"
+
+        # 一覧も同様にETagで304を返し、ページ内容が変わるとETagも変わる
+        list_response = integration_test_client.get("/todos/")
+        list_etag = list_response.headers["ETag"]
+        response = integration_test_client.get("/todos/", headers={"If-None-Match": list_etag})
+        assert response.status_code == 304
+
+        integration_test_client.post("/todos/", json={"title": "ETagテスト2"})
+        response = integration_test_client.get("/todos/", headers={"If-None-Match": list_etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != list_etag
+
     def test_get_todo_by_id_not_found(self, integration_test_client):
         """存在しないToDoアイテム取得のテスト"""
         response = integration_test_client.get("/todos/999")
@@ -237,18 +364,9 @@ class TestTodoEndpoints:
         data = response.json()
         assert "detail" in data
     
-    def test_update_todo_success(self, integration_test_client):
+    def test_update_todo_success(self, integration_test_client, created_integration_test_todo):
         """ToDoアイテム更新の正常ケーステスト"""
-        # テストデータを作成
-        todo_data = {
-            "title": "元のタスク",
-            "description": "元の説明",
-            "completed": False
-        }
-        
-        create_response = integration_test_client.post("/todos/", json=todo_data)
-        assert create_response.status_code == 201
-        created_todo = create_response.json()
+        created_todo = created_integration_test_todo
         
         # ToDoアイテムを更新
         update_data = {
@@ -267,18 +385,12 @@ class TestTodoEndpoints:
         assert data["completed"] == update_data["completed"]
         assert data["updated_at"] >= created_todo["updated_at"]
     
-    def test_update_todo_partial(self, integration_test_client):
+    def test_update_todo_partial(
+        self, integration_test_client, created_integration_test_todo, integration_test_todo_data
+    ):
         """部分的なToDoアイテム更新テスト"""
-        # テストデータを作成
-        todo_data = {
-            "title": "元のタスク",
-            "description": "元の説明",
-            "completed": False
-        }
-        
-        create_response = integration_test_client.post("/todos/", json=todo_data)
-        assert create_response.status_code == 201
-        created_todo = create_response.json()
+        todo_data = integration_test_todo_data
+        created_todo = created_integration_test_todo
         
         # 完了状態のみを更新
         update_data = {"completed": True}
@@ -306,14 +418,9 @@ class TestTodoEndpoints:
         assert "detail" in data
         assert "not found" in data["detail"].lower()
     
-    def test_update_todo_validation_error(self, integration_test_client):
+    def test_update_todo_validation_error(self, integration_test_client, created_integration_test_todo):
         """ToDoアイテム更新時のバリデーションエラーテスト"""
-        # テストデータを作成
-        todo_data = {"title": "テストタスク", "completed": False}
-        
-        create_response = integration_test_client.post("/todos/", json=todo_data)
-        assert create_response.status_code == 201
-        created_todo = create_response.json()
+        created_todo = created_integration_test_todo
         
         # 無効なデータで更新を試行
         update_data = {"title": ""}  # 空のタイトル
@@ -324,18 +431,9 @@ class TestTodoEndpoints:
         data = response.json()
         assert "detail" in data
     
-    def test_delete_todo_success(self, integration_test_client):
+    def test_delete_todo_success(self, integration_test_client, created_integration_test_todo):
         """ToDoアイテム削除の正常ケーステスト"""
-        # テストデータを作成
-        todo_data = {
-            "title": "削除予定のタスク",
-            "description": "このタスクは削除されます",
-            "completed": False
-        }
-        
-        create_response = integration_test_client.post("/todos/", json=todo_data)
-        assert create_response.status_code == 201
-        created_todo = create_response.json()
+        created_todo = created_integration_test_todo
         
         # ToDoアイテムを削除
         response = integration_test_client.delete(f"/todos/{created_todo['id']}")
@@ -365,6 +463,7 @@ class TestTodoEndpoints:
         assert "detail" in data
 
 
+@pytest.mark.integration
 class TestTodoEndpointsEndToEnd:
     """ToDoエンドポイントのエンドツーエンドテスト"""
     
@@ -471,41 +570,34 @@ class TestTodoEndpointsEndToEnd:
 class TestErrorHandling:
     """エラーハンドリングのテスト"""
     
-    def test_invalid_json_request(self, integration_test_client):
-        """無効なJSONリクエストのテスト"""
-        response = integration_test_client.post(
-            "/todos/",
-            data="invalid json",
-            headers={"Content-Type": "application/json"}
-        )
-        
-        assert response.status_code == 422
-    
-    def test_missing_required_fields(self, integration_test_client):
-        """必須フィールドが欠けているリクエストのテスト"""
-        response = integration_test_client.post("/todos/", json={})
-        
-        assert response.status_code == 422
-        data = response.json()
-        assert "detail" in data
-    
-    def test_invalid_content_type(self, integration_test_client):
-        """無効なContent-Typeのテスト"""
-        response = integration_test_client.post(
-            "/todos/",
-            content="title=test",
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
-        )
-        
-        assert response.status_code == 422
-        data = response.json()
-        assert "detail" in data
-    
-    def test_method_not_allowed(self, integration_test_client):
-        """許可されていないHTTPメソッドのテスト"""
-        response = integration_test_client.patch("/todos/1")
+    @pytest.mark.parametrize(
+        "method, url, kwargs, expected_status",
+        [
+            # 無効なJSONリクエスト
+            pytest.param(
+                "post", "/todos/",
+                {"content": "invalid json", "headers": {"Content-Type": "application/json"}},
+                422,
+                id="invalid_json"
+            ),
+            # 必須フィールドが欠けているリクエスト
+            pytest.param("post", "/todos/", {"json": {}}, 422, id="missing_required_fields"),
+            # 無効なContent-Type
+            pytest.param(
+                "post", "/todos/",
+                {"content": "title=test", "headers": {"Content-Type": "application/x-www-form-urlencoded"}},
+                422,
+                id="invalid_content_type"
+            ),
+            # 許可されていないHTTPメソッド
+            pytest.param("patch", "/todos/1", {}, 405, id="method_not_allowed"),
+        ]
+    )
+    def test_error_responses(self, integration_test_client, method, url, kwargs, expected_status):
+        """不正なリクエストがエラーステータスとdetailを含むレスポンスを返すことのテスト"""
+        response = integration_test_client.request(method, url, **kwargs)
         
-        assert response.status_code == 405
+        assert response.status_code == expected_status
         data = response.json()
         assert "detail" in data
 
@@ -558,4 +650,58 @@ class TestResponseFormat:
         assert response.status_code == 422
         
         data = response.json()
-        assert "detail" in data
\ No newline at end of file
+        assert "detail" in data
+
+    def test_validation_error_truncates_oversized_body(self, integration_test_client):
+        """巨大な不正JSONボディ・入力値がレスポンスで切り詰められることのテスト"""
+        # 不正なJSON（ボディは文字列としてハンドラーに渡される）
+        malformed = '{"title": "' + "あ" * 5000
+        response = integration_test_client.post(
+            "/todos/", content=malformed.encode(), headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 422
+        body = response.json()["body"]
+        assert len(body.encode()) <= MAX_ECHO_BODY_BYTES
+        assert malformed.startswith(body)
+
+        # 各エラーのinput（上限を超える長さのタイトル）
+        response = integration_test_client.post("/todos/", json={"title": "a" * 10000})
+        assert response.status_code == 422
+        assert all(
+            len(str(error.get("input", "")).encode()) <= MAX_ECHO_BODY_BYTES
+            for error in response.json()["detail"]
+        )
+
+    def test_validation_error_truncates_oversized_parsed_body(self, integration_test_client):
+        """正しいJSONでも巨大なボディ・dictのinputがレスポンスで切り詰められることのテスト"""
+        # 1つのフィールドだけが巨大なボディ（inputは小さいが、ボディ全体は上限を超える）
+        response = integration_test_client.post(
+            "/todos/", json={"title": "ok", "x": "z" * 1_000_000, "completed": "nope"}
+        )
+        assert response.status_code == 422
+        assert len(response.content) < 4 * MAX_ECHO_BODY_BYTES
+        body = response.json()["body"]
+        assert isinstance(body, str)
+        assert len(body.encode()) <= MAX_ECHO_BODY_BYTES
+
+        # 必須フィールドの欠落（inputはボディ全体のdictになる）
+        response = integration_test_client.post("/todos/", json={"x": "z" * 1_000_000})
+        assert response.status_code == 422
+        assert len(response.content) < 4 * MAX_ECHO_BODY_BYTES
+        assert all(
+            len(str(error.get("input", "")).encode()) <= MAX_ECHO_BODY_BYTES
+            for error in response.json()["detail"]
+        )
+
+        # 上限以内のボディはパース済みの値のまま返す
+        response = integration_test_client.post("/todos/", json={"title": "ok", "completed": "nope"})
+        assert response.json()["body"] == {"title": "ok", "completed": "nope"}
+
+    def test_validation_error_echoes_integer_beyond_64_bits(self, integration_test_client):
+        """64ビットを超える整数の入力でも500ではなく422を返すことのテスト"""
+        huge = 1180591620717411303424
+        response = integration_test_client.post("/todos/", json={"title": "ok", "completed": huge})
+        assert response.status_code == 422
+        data = response.json()
+        assert data["body"]["completed"] == huge
+        assert data["detail"][0]["input"] == huge
\ No newline at end of file
@@ -6,67 +6,22 @@ end_dateフィールドに関連する機能のテストを実装する。
 import pytest
 from datetime import datetime, timezone, timedelta
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 
-from app.main import app
-from app.database import get_db, Base
-from app.models.todo import Todo
 
+# 期限日時の基準時刻（アプリはend_dateを現在時刻と比較しないため固定値でよい）
+# 実行時刻に依存しないため、日付の境界をまたいでも結果が変わらない
+REFERENCE_TIME = datetime(2025, 1, 15, tzinfo=timezone.utc)
 
-# テスト用データベース設定
-TEST_DATABASE_URL = "sqlite:///:memory:"
 
-test_engine = create_engine(
-    TEST_DATABASE_URL,
-    poolclass=StaticPool,
-    connect_args={"check_same_thread": False},
-    echo=False
-)
-
-TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
-
-
-def override_get_db():
-    """テスト用データベースセッションを提供する"""
-    try:
-        db = TestSessionLocal()
-        yield db
-    finally:
-        db.close()
-
-
-# データベース依存関係をオーバーライド
-app.dependency_overrides[get_db] = override_get_db
-
-
-@pytest.fixture(scope="module")
-def test_client():
-    """テスト用FastAPIクライアントを作成する"""
-    Base.metadata.create_all(bind=test_engine)
-    
-    with TestClient(app) as client:
-        yield client
-    
-    # テスト後のクリーンアップ
-    Base.metadata.drop_all(bind=test_engine)
-
-
-@pytest.fixture(autouse=True)
-def clean_database():
-    """各テスト前にデータベースをクリーンアップする"""
-    # テスト前のクリーンアップ
-    with TestSessionLocal() as db:
-        db.query(Todo).delete()
-        db.commit()
-    
-    yield
+@pytest.fixture
+def test_client(integration_test_client: TestClient) -> TestClient:
+    """
+    テスト用FastAPIクライアントを提供する
     
-    # テスト後のクリーンアップ
-    with TestSessionLocal() as db:
-        db.query(Todo).delete()
-        db.commit()
+    conftestの統合テスト用クライアントを使い、テストごとのデータは
+    外側のトランザクションのロールバックで破棄される。
+    """
+    return integration_test_client
 
 
 class TestTodoEndDate:
@@ -74,7 +29,7 @@ class TestTodoEndDate:
     
     def test_create_todo_with_end_date(self, test_client):
         """end_dateを指定してToDoアイテムを作成するテスト"""
-        future_date = datetime.now(timezone.utc) + timedelta(days=7)
+        future_date = REFERENCE_TIME + timedelta(days=7)
         
         todo_data = {
             "title": "期限付きタスク",
@@ -121,7 +76,7 @@ class TestTodoEndDate:
         todo_id = create_response.json()["id"]
         
         # end_dateを追加
-        future_date = datetime.now(timezone.utc) + timedelta(days=3)
+        future_date = REFERENCE_TIME + timedelta(days=3)
         update_data = {
             "end_date": future_date.isoformat()
         }
@@ -136,7 +91,7 @@ class TestTodoEndDate:
     def test_update_todo_remove_end_date(self, test_client):
         """ToDoアイテムからend_dateを削除するテスト"""
         # end_date付きのToDoアイテムを作成
-        future_date = datetime.now(timezone.utc) + timedelta(days=5)
+        future_date = REFERENCE_TIME + timedelta(days=5)
         todo_data = {
             "title": "期限を削除するタスク",
             "description": "後で期限を削除する",
@@ -161,7 +116,7 @@ class TestTodoEndDate:
     
     def test_get_todo_with_end_date(self, test_client):
         """end_date付きのToDoアイテムを取得するテスト"""
-        future_date = datetime.now(timezone.utc) + timedelta(days=2)
+        future_date = REFERENCE_TIME + timedelta(days=2)
         todo_data = {
             "title": "取得テスト用タスク",
             "description": "end_date付きの取得テスト",
@@ -188,7 +143,7 @@ class TestTodoEndDateValidation:
     
     def test_create_todo_with_past_end_date(self, test_client):
         """過去の日付をend_dateに設定してToDoアイテムを作成するテスト"""
-        past_date = datetime.now(timezone.utc) - timedelta(days=1)
+        past_date = REFERENCE_TIME - timedelta(days=1)
         
         todo_data = {
             "title": "過去の期限のタスク",
@@ -219,13 +174,14 @@ class TestTodoEndDateValidation:
         assert response.status_code == 422
 
 
+@pytest.mark.integration
 class TestTodoEndDateIntegration:
     """ToDoアイテムのend_date統合テスト"""
     
     def test_todo_workflow_with_end_date(self, test_client):
         """end_dateを含むToDoアイテムの完全なワークフローテスト"""
         # 1. end_date付きのToDoアイテムを作成
-        future_date = datetime.now(timezone.utc) + timedelta(days=10)
+        future_date = REFERENCE_TIME + timedelta(days=10)
         todo_data = {
             "title": "統合テスト用タスク",
             "description": "完全なワークフローのテスト",
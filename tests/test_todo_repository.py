@@ -4,20 +4,41 @@ TodoRepositoryの単体テスト
 ToDoリポジトリのCRUD操作とデータベース統合をテストする。
 """
 import pytest
+from operator import attrgetter
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.repositories.todo import TodoRepository
-from app.schemas.todo import TodoCreate, TodoUpdate
+from app.schemas.todo import DESCRIPTION_MAX_LENGTH, TITLE_MAX_LENGTH, TodoCreate, TodoUpdate
 from app.models.todo import Todo
 
+# 最小限・最大長の入力（リポジトリは入力を変更しないため、モジュール読み込み時に1回だけ検証して共有する）
+_MINIMAL_CREATE = TodoCreate(title="最小限のタスク")
+_LONG_TITLE_CREATE = TodoCreate(title="a" * TITLE_MAX_LENGTH)
+_LONG_DESCRIPTION_CREATE = TodoCreate(title="テストタスク", description="a" * DESCRIPTION_MAX_LENGTH)
+
 
 class TestTodoRepository:
     """TodoRepositoryのテストクラス"""
     
-    def test_create_todo(self, todo_repository: TodoRepository, sample_todo_data):
+    @pytest.mark.parametrize(
+        "todo_data",
+        [
+            # conftestのサンプルデータ（フィクスチャ名で指定する）
+            pytest.param("sample_todo_data", id="sample_data"),
+            pytest.param(_MINIMAL_CREATE, id="minimal_data"),
+            pytest.param(_LONG_TITLE_CREATE, id="long_title"),
+            pytest.param(_LONG_DESCRIPTION_CREATE, id="long_description"),
+        ],
+    )
+    def test_create_todo(self, request, todo_repository: TodoRepository, todo_data):
         """ToDoアイテムの作成をテストする"""
         # Arrange
-        todo_create = TodoCreate(**sample_todo_data)
+        if isinstance(todo_data, str):
+            todo_create = TodoCreate(**request.getfixturevalue(todo_data))
+        else:
+            todo_create = todo_data
+        # 省略したフィールドはデフォルト値（説明なし・未完了）になる
+        expected = {"description": None, "completed": False, **todo_create.model_dump(exclude_unset=True)}
         
         # Act
         created_todo = todo_repository.create(todo_create)
@@ -25,27 +46,11 @@ class TestTodoRepository:
         # Assert
         assert created_todo is not None
         assert created_todo.id is not None
-        assert created_todo.title == sample_todo_data["title"]
-        assert created_todo.description == sample_todo_data["description"]
-        assert created_todo.completed == sample_todo_data["completed"]
+        for field, value in expected.items():
+            assert getattr(created_todo, field) == value
         assert created_todo.created_at is not None
         assert created_todo.updated_at is not None
     
-    def test_create_todo_with_minimal_data(self, todo_repository: TodoRepository):
-        """最小限のデータでToDoアイテムの作成をテストする"""
-        # Arrange
-        todo_create = TodoCreate(title="最小限のタスク")
-        
-        # Act
-        created_todo = todo_repository.create(todo_create)
-        
-        # Assert
-        assert created_todo is not None
-        assert created_todo.id is not None
-        assert created_todo.title == "最小限のタスク"
-        assert created_todo.description is None
-        assert created_todo.completed is False
-    
     def test_get_by_id_existing(self, todo_repository: TodoRepository, created_todo: Todo):
         """存在するToDoアイテムをIDで取得するテスト"""
         # Act
@@ -74,31 +79,53 @@ class TestTodoRepository:
         # Assert
         assert todos == []
     
-    def test_get_all_with_data(self, todo_repository: TodoRepository, created_todos: list[Todo]):
+    def test_get_all_with_data(self, todo_repository: TodoRepository, created_todos: list[Todo], count_queries):
         """データが存在する場合のすべてのToDoアイテム取得テスト"""
         # Act
-        todos = todo_repository.get_all()
+        with count_queries() as queries:
+            todos = todo_repository.get_all()
         
         # Assert
+        assert len(queries) == 1  # N+1が発生しないこと
         assert len(todos) == len(created_todos)
         # 作成日時の降順でソートされていることを確認
-        for i in range(len(todos) - 1):
-            assert todos[i].created_at >= todos[i + 1].created_at
+        created_ats = [todo.created_at for todo in todos]
+        assert created_ats == sorted(created_ats, reverse=True)
     
     def test_get_all_with_pagination(self, todo_repository: TodoRepository, created_todos: list[Todo]):
         """ページネーション付きでToDoアイテムを取得するテスト"""
+        # Arrange
+        # get_allと同じ並び順（作成日時の降順、同時刻はIDの降順）
+        expected_ids = [
+            todo.id for todo in sorted(created_todos, key=attrgetter("created_at", "id"), reverse=True)
+        ]
+        
         # Act
         first_page = todo_repository.get_all(skip=0, limit=2)
         second_page = todo_repository.get_all(skip=2, limit=2)
         
         # Assert
-        assert len(first_page) == 2
-        assert len(second_page) == 1  # 3つのアイテムがあるので、2つ目のページには1つ
+        # 3つのアイテムがあるので、2つ目のページには1つ（重複・取りこぼしがないこと）
+        assert [todo.id for todo in first_page] == expected_ids[:2]
+        assert [todo.id for todo in second_page] == expected_ids[2:4]
+    
+    def test_get_page_returns_items_and_total(self, todo_repository: TodoRepository, created_todos: list[Todo]):
+        """1ページ分のアイテムと総件数を1回で取得するテスト"""
+        # Act
+        todos, total = todo_repository.get_page(skip=0, limit=2)
+        
+        # Assert
+        assert len(todos) == 2
+        assert total == len(created_todos)
+    
+    def test_get_page_out_of_range(self, todo_repository: TodoRepository, created_todos: list[Todo]):
+        """範囲外のページでも総件数が返されることをテストする"""
+        # Act
+        todos, total = todo_repository.get_page(skip=10, limit=2)
         
-        # 重複がないことを確認
-        first_page_ids = {todo.id for todo in first_page}
-        second_page_ids = {todo.id for todo in second_page}
-        assert first_page_ids.isdisjoint(second_page_ids)
+        # Assert
+        assert todos == []
+        assert total == len(created_todos)
     
     def test_update_existing_todo(self, todo_repository: TodoRepository, created_todo: Todo):
         """存在するToDoアイテムの更新をテストする"""
@@ -137,6 +164,24 @@ class TestTodoRepository:
         assert updated_todo.description == original_description  # 変更されていない
         assert updated_todo.completed is True  # 変更されている
     
+    def test_update_todo_loaded_in_session(self, todo_repository: TodoRepository, created_todo: Todo):
+        """セッションに読み込み済みのToDoアイテムを更新した場合に新しい値が返ることのテスト"""
+        # Arrange（アプリのSessionLocalと同じくコミット時に属性を失効させず、
+        # 更新前にIDで取得してセッションのidentity mapに載せる。identity mapは弱参照のため変数に保持する）
+        todo_repository.db.expire_on_commit = False
+        loaded_todo = todo_repository.get_by_id(created_todo.id)
+        assert loaded_todo is not None
+        
+        # Act
+        updated_todo = todo_repository.update(created_todo.id, TodoUpdate(title="更新後のタイトル", completed=True))
+        
+        # Assert
+        assert updated_todo is loaded_todo
+        assert updated_todo.title == "更新後のタイトル"
+        assert updated_todo.completed is True
+        reloaded = todo_repository.get_by_id(created_todo.id)
+        assert (reloaded.title, reloaded.completed) == ("更新後のタイトル", True)
+    
     def test_update_non_existing_todo(self, todo_repository: TodoRepository):
         """存在しないToDoアイテムの更新をテストする"""
         # Arrange
@@ -168,24 +213,54 @@ class TestTodoRepository:
         # Assert
         assert result is False
     
-    def test_get_by_completion_status_completed(self, todo_repository: TodoRepository, created_todos: list[Todo]):
-        """完了済みのToDoアイテムを取得するテスト"""
+    @pytest.mark.parametrize(
+        ("status", "expected_count"),
+        [
+            pytest.param(True, 1, id="completed"),  # sample_todo_data_listで1つだけ完了済み
+            pytest.param(False, 2, id="incomplete"),  # sample_todo_data_listで2つが未完了
+        ],
+    )
+    def test_completion_queries(
+        self,
+        todo_repository: TodoRepository,
+        created_todos: list[Todo],
+        count_queries,
+        status: bool,
+        expected_count: int
+    ):
+        """完了状態別の取得・カウントと総数カウントのテスト"""
         # Act
-        completed_todos = todo_repository.get_by_completion_status(True)
+        with count_queries() as queries:
+            todos = todo_repository.get_by_completion_status(status)
+        count = todo_repository.count_by_completion_status(status)
         
         # Assert
-        assert len(completed_todos) == 1  # sample_todo_data_listで1つだけ完了済み
-        assert all(todo.completed for todo in completed_todos)
-    
-    def test_get_by_completion_status_incomplete(self, todo_repository: TodoRepository, created_todos: list[Todo]):
-        """未完了のToDoアイテムを取得するテスト"""
+        assert len(queries) == 1  # N+1が発生しないこと
+        assert len(todos) == expected_count
+        assert all(todo.completed is status for todo in todos)
+        assert count == expected_count
+        assert todo_repository.count_all() == len(created_todos)
+
+    def test_get_by_completion_status_with_pagination(self, todo_repository: TodoRepository, created_todos: list[Todo]):
+        """完了状態での取得にページネーションが適用されることのテスト"""
         # Act
-        incomplete_todos = todo_repository.get_by_completion_status(False)
-        
+        first_page = todo_repository.get_by_completion_status(False, skip=0, limit=1)
+        second_page = todo_repository.get_by_completion_status(False, skip=1, limit=1)
+
         # Assert
-        assert len(incomplete_todos) == 2  # sample_todo_data_listで2つが未完了
-        assert all(not todo.completed for todo in incomplete_todos)
-    
+        assert len(first_page) == 1
+        assert len(second_page) == 1
+        assert first_page[0].id != second_page[0].id
+
+    def test_stream_by_completion_status(self, todo_repository: TodoRepository, created_todos: list[Todo]):
+        """完了状態でのストリーミング取得のテスト"""
+        # Act
+        streamed = list(todo_repository.stream_by_completion_status(False, batch_size=1))
+
+        # Assert
+        assert len(streamed) == 2
+        assert all(not todo.completed for todo in streamed)
+
     def test_count_all_empty(self, todo_repository: TodoRepository):
         """空のデータベースでのカウントテスト"""
         # Act
@@ -194,53 +269,22 @@ class TestTodoRepository:
         # Assert
         assert count == 0
     
-    def test_count_all_with_data(self, todo_repository: TodoRepository, created_todos: list[Todo]):
-        """データが存在する場合のカウントテスト"""
+    def test_get_stats(self, todo_repository: TodoRepository, created_todos: list[Todo]):
+        """総数と完了数を1回で取得するテスト"""
         # Act
-        count = todo_repository.count_all()
+        total, completed = todo_repository.get_stats()
         
         # Assert
-        assert count == len(created_todos)
+        assert total == len(created_todos)
+        assert completed == 1  # sample_todo_data_listで1つが完了済み
     
-    def test_count_by_completion_status(self, todo_repository: TodoRepository, created_todos: list[Todo]):
-        """完了状態別のカウントテスト"""
+    def test_get_stats_empty(self, todo_repository: TodoRepository):
+        """空のデータベースでの統計取得テスト"""
         # Act
-        completed_count = todo_repository.count_by_completion_status(True)
-        incomplete_count = todo_repository.count_by_completion_status(False)
+        total, completed = todo_repository.get_stats()
         
         # Assert
-        assert completed_count == 1  # sample_todo_data_listで1つが完了済み
-        assert incomplete_count == 2  # sample_todo_data_listで2つが未完了
-        assert completed_count + incomplete_count == len(created_todos)
-    
-    def test_create_todo_with_long_title(self, todo_repository: TodoRepository):
-        """長いタイトルでのToDoアイテム作成テスト"""
-        # Arrange
-        long_title = "a" * 200  # 最大長
-        todo_create = TodoCreate(title=long_title)
-        
-        # Act
-        created_todo = todo_repository.create(todo_create)
-        
-        # Assert
-        assert created_todo is not None
-        assert created_todo.title == long_title
-    
-    def test_create_todo_with_long_description(self, todo_repository: TodoRepository):
-        """長い説明でのToDoアイテム作成テスト"""
-        # Arrange
-        long_description = "a" * 1000  # 最大長
-        todo_create = TodoCreate(
-            title="テストタスク",
-            description=long_description
-        )
-        
-        # Act
-        created_todo = todo_repository.create(todo_create)
-        
-        # Assert
-        assert created_todo is not None
-        assert created_todo.description == long_description
+        assert (total, completed) == (0, 0)
 
 
 class TestTodoRepositoryErrorHandling:
@@ -271,4 +315,4 @@ class TestTodoRepositoryErrorHandling:
         # セッションの状態を確認
         # 正常なケースではコミットが実行されている
         todo_from_db = todo_repository.get_by_id(created_todo.id)
-        assert todo_from_db is not None
\ No newline at end of file
+        assert todo_from_db is not None
@@ -5,197 +5,152 @@ ToDoアイテム検索機能のテスト
 """
 import pytest
 from datetime import datetime, timezone, timedelta
+from typing import NamedTuple
+
 from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import CacheStats
 from sqlalchemy.orm import Session
 
 from app.main import app
 from app.models.todo import Todo
-from app.schemas.todo import TodoSearchParams
+from app.schemas.todo import TodoSearchParams, encode_cursor
 from app.services.todo import TodoService
 
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# 現在時刻に依存しないスキーマのテストで使う固定の基準日時
+REFERENCE_TIME = datetime(2025, 1, 15, tzinfo=timezone.utc)
+
+# 検索テスト用のToDoデータ（タイトル, 説明, 完了状態, 期限）
+# 期限はTimeAnchorsの基準日時名（yesterday・tomorrow）で指定し、テストデータ作成時に解決する
+SEED_TODOS = (
+    # 完了済み、期限なし
+    ("Completed Task", "This is completed", True, None),
+    # 未完了、期限切れ
+    ("Overdue Task", "This is overdue", False, "yesterday"),
+    # 未完了、期限あり（未来）
+    ("Future Task", "This has future deadline", False, "tomorrow"),
+    # 完了済み、期限あり（過去）
+    ("Completed Overdue Task", "This was completed even though overdue", True, "yesterday"),
+    # 未完了、期限なし
+    ("No Deadline Task", "This has no deadline", False, None),
+)
+
+
+class TimeAnchors(NamedTuple):
+    """検索テストで共有する基準日時とそのISO形式文字列"""
+    now: datetime
+    yesterday: datetime
+    tomorrow: datetime
+    now_iso: str
+    yesterday_iso: str
+    tomorrow_iso: str
+
+
+@pytest.fixture(scope="class")
+def time_anchors() -> TimeAnchors:
+    """
+    クラス内で共有する基準日時を作成する
+
+    テストデータと検索条件を同じ基準日時から作成するため、
+    秒の境界をまたいでも検索結果が変わらない。
+
+    Returns:
+        TimeAnchors: 基準日時と前後1日の日時、およびそのISO形式文字列
+    """
+    now = datetime.now(timezone.utc)
+    yesterday = now - timedelta(days=1)
+    tomorrow = now + timedelta(days=1)
+    return TimeAnchors(
+        now=now,
+        yesterday=yesterday,
+        tomorrow=tomorrow,
+        now_iso=now.strftime(ISO_FORMAT),
+        yesterday_iso=yesterday.strftime(ISO_FORMAT),
+        tomorrow_iso=tomorrow.strftime(ISO_FORMAT),
+    )
+
 
 class TestTodoSearch:
     """ToDoアイテム検索機能のテストクラス"""
     
     @pytest.fixture(autouse=True)
-    def setup_test_data(self, integration_test_client: TestClient):
+    def setup_test_data(
+        self,
+        integration_test_client: TestClient,
+        seed_integration_todos,
+        time_anchors: TimeAnchors
+    ):
         """テスト用データのセットアップ"""
         self.client = integration_test_client
-        
-        # テスト用のToDoアイテムを作成
-        now = datetime.now(timezone.utc)
-        yesterday = now - timedelta(days=1)
-        tomorrow = now + timedelta(days=1)
-        
-        # 完了済み、期限なし
-        todo1_data = {
-            "title": "Completed Task",
-            "description": "This is completed",
-            "completed": True,
-            "end_date": None
-        }
-        
-        # 未完了、期限切れ
-        todo2_data = {
-            "title": "Overdue Task",
-            "description": "This is overdue",
-            "completed": False,
-            "end_date": yesterday.strftime('%Y-%m-%dT%H:%M:%SZ')
-        }
-        
-        # 未完了、期限あり（未来）
-        todo3_data = {
-            "title": "Future Task",
-            "description": "This has future deadline",
-            "completed": False,
-            "end_date": tomorrow.strftime('%Y-%m-%dT%H:%M:%SZ')
-        }
-        
-        # 完了済み、期限あり（過去）
-        todo4_data = {
-            "title": "Completed Overdue Task",
-            "description": "This was completed even though overdue",
-            "completed": True,
-            "end_date": yesterday.strftime('%Y-%m-%dT%H:%M:%SZ')
-        }
-        
-        # 未完了、期限なし
-        todo5_data = {
-            "title": "No Deadline Task",
-            "description": "This has no deadline",
-            "completed": False,
-            "end_date": None
-        }
-        
-        # APIを使用してToDoアイテムを作成
-        todos_data = [todo1_data, todo2_data, todo3_data, todo4_data, todo5_data]
-        self.created_todos = []
-        
-        for todo_data in todos_data:
-            response = self.client.post("/todos/", json=todo_data)
-            assert response.status_code == 201
-            self.created_todos.append(response.json())
-    
-    def test_search_by_completed_true(self):
-        """完了済みタスクの検索テスト"""
-        response = self.client.get("/todos/search?completed=true")
-        
-        assert response.status_code == 200
-        todos = response.json()
-        
-        # 完了済みタスクのみが返される
-        assert len(todos) == 2
-        for todo in todos:
-            assert todo["completed"] is True
-        
-        # 特定のタスクが含まれていることを確認
-        titles = [todo["title"] for todo in todos]
-        assert "Completed Task" in titles
-        assert "Completed Overdue Task" in titles
-    
-    def test_search_by_completed_false(self):
-        """未完了タスクの検索テスト"""
-        response = self.client.get("/todos/search?completed=false")
-        
-        assert response.status_code == 200
-        todos = response.json()
-        
-        # 未完了タスクのみが返される
-        assert len(todos) == 3
-        for todo in todos:
-            assert todo["completed"] is False
-        
-        # 特定のタスクが含まれていることを確認
-        titles = [todo["title"] for todo in todos]
-        assert "Overdue Task" in titles
-        assert "Future Task" in titles
-        assert "No Deadline Task" in titles
-    
-    def test_search_by_end_date_from(self):
-        """期限開始日時での検索テスト"""
-        # 今日以降の期限を持つタスクを検索
-        now = datetime.now(timezone.utc)
-        from_date = now.strftime('%Y-%m-%dT%H:%M:%SZ')
-        
-        response = self.client.get(f"/todos/search?end_date_from={from_date}")
-        
-        assert response.status_code == 200
-        todos = response.json()
-        
-        # 今日以降の期限を持つタスクのみが返される
-        assert len(todos) == 1
-        assert todos[0]["title"] == "Future Task"
-        assert todos[0]["end_date"] is not None
-    
-    def test_search_by_end_date_to(self):
-        """期限終了日時での検索テスト"""
-        # 今日以前の期限を持つタスクを検索
-        now = datetime.now(timezone.utc)
-        to_date = now.strftime('%Y-%m-%dT%H:%M:%SZ')
-        
-        response = self.client.get(f"/todos/search?end_date_to={to_date}")
-        
-        assert response.status_code == 200
-        todos = response.json()
-        
-        # 今日以前の期限を持つタスクが返される
-        assert len(todos) == 2
-        titles = [todo["title"] for todo in todos]
-        assert "Overdue Task" in titles
-        assert "Completed Overdue Task" in titles
-    
-    def test_search_by_date_range(self):
-        """期限日時範囲での検索テスト"""
-        # 昨日から明日までの範囲で検索
-        now = datetime.now(timezone.utc)
-        yesterday = now - timedelta(days=1)
-        tomorrow = now + timedelta(days=1)
-        
-        from_date = yesterday.strftime('%Y-%m-%dT%H:%M:%SZ')
-        to_date = tomorrow.strftime('%Y-%m-%dT%H:%M:%SZ')
-        
-        response = self.client.get(
-            f"/todos/search?end_date_from={from_date}&end_date_to={to_date}"
-        )
-        
-        assert response.status_code == 200
-        todos = response.json()
-        
-        # 指定範囲内の期限を持つタスクが返される
-        assert len(todos) == 3
-        titles = [todo["title"] for todo in todos]
-        assert "Overdue Task" in titles
-        assert "Future Task" in titles
-        assert "Completed Overdue Task" in titles
-    
-    def test_search_combined_conditions(self):
-        """複数条件の組み合わせ検索テスト"""
-        # 未完了かつ期限切れのタスクを検索
-        now = datetime.now(timezone.utc)
-        to_date = now.strftime('%Y-%m-%dT%H:%M:%SZ')
-        
-        response = self.client.get(
-            f"/todos/search?completed=false&end_date_to={to_date}"
-        )
-        
-        assert response.status_code == 200
-        todos = response.json()
-        
-        # 未完了かつ期限切れのタスクのみが返される
-        assert len(todos) == 1
-        assert todos[0]["title"] == "Overdue Task"
-        assert todos[0]["completed"] is False
-        assert todos[0]["end_date"] is not None
+        self.anchors = time_anchors
+        
+        # 検索の前提データのためAPIを経由せずデータベースへ直接作成する
+        todos_data = [
+            {
+                "title": title,
+                "description": description,
+                "completed": completed,
+                "end_date": None if end_date is None else getattr(time_anchors, f"{end_date}_iso")
+            }
+            for title, description, completed, end_date in SEED_TODOS
+        ]
+        self.created_todos = seed_integration_todos(todos_data)
     
-    def test_search_no_parameters(self):
-        """パラメータなしの検索テスト（全件取得）"""
-        response = self.client.get("/todos/search")
+    @pytest.mark.parametrize(
+        ("query", "expected_titles"),
+        [
+            # 完了済みタスクのみ
+            pytest.param(
+                "completed=true",
+                ["Completed Task", "Completed Overdue Task"],
+                id="completed_true"
+            ),
+            # 未完了タスクのみ
+            pytest.param(
+                "completed=false",
+                ["Overdue Task", "Future Task", "No Deadline Task"],
+                id="completed_false"
+            ),
+            # 今日以降の期限を持つタスク
+            pytest.param("end_date_from={now_iso}", ["Future Task"], id="end_date_from"),
+            # 今日以前の期限を持つタスク
+            pytest.param(
+                "end_date_to={now_iso}",
+                ["Overdue Task", "Completed Overdue Task"],
+                id="end_date_to"
+            ),
+            # 昨日から明日までの範囲
+            pytest.param(
+                "end_date_from={yesterday_iso}&end_date_to={tomorrow_iso}",
+                ["Overdue Task", "Future Task", "Completed Overdue Task"],
+                id="date_range"
+            ),
+            # 未完了かつ期限切れ
+            pytest.param(
+                "completed=false&end_date_to={now_iso}",
+                ["Overdue Task"],
+                id="combined_conditions"
+            ),
+            # パラメータなし（全件取得）
+            pytest.param(
+                "",
+                ["Completed Task", "Overdue Task", "Future Task", "Completed Overdue Task", "No Deadline Task"],
+                id="no_parameters"
+            ),
+        ]
+    )
+    def test_search_filters(self, query, expected_titles):
+        """検索条件ごとに該当するタスクのみが返されることのテスト"""
+        # クエリ中の{now_iso}などは基準日時のISO形式文字列に置き換える
+        query = query.format(**self.anchors._asdict())
+        response = self.client.get(f"/todos/search?{query}")
         
         assert response.status_code == 200
-        todos = response.json()
-        
-        # すべてのタスクが返される
-        assert len(todos) == 5
+        titles = [todo["title"] for todo in response.json()]
+        assert sorted(titles) == sorted(expected_titles)
     
     def test_search_with_pagination(self):
         """ページネーション付き検索テスト"""
@@ -220,52 +175,61 @@ class TestTodoSearch:
         todos = response.json()
         assert len(todos) == 1
     
-    def test_search_invalid_date_format(self):
-        """無効な日時形式でのバリデーションエラーテスト"""
-        response = self.client.get("/todos/search?end_date_from=invalid-date")
-        
-        assert response.status_code == 422
-        error_detail = response.json()["detail"]
-        assert "Input should be a valid datetime" in str(error_detail)
-    
-    def test_search_invalid_boolean_format(self):
-        """無効なboolean値でのバリデーションエラーテスト"""
-        response = self.client.get("/todos/search?completed=invalid-bool")
-        
-        assert response.status_code == 422
-        error_detail = response.json()["detail"]
-        assert "Input should be a valid boolean" in str(error_detail)
-    
-    def test_search_invalid_date_range(self):
-        """無効な日時範囲でのバリデーションエラーテスト"""
-        now = datetime.now(timezone.utc)
-        yesterday = now - timedelta(days=1)
+    def test_search_with_cursor_pagination(self):
+        """カーソルページネーション付き検索テスト"""
+        response = self.client.get("/todos/search?completed=false&limit=2")
         
-        # end_date_fromがend_date_toより後の場合
-        from_date = now.strftime('%Y-%m-%dT%H:%M:%SZ')
-        to_date = yesterday.strftime('%Y-%m-%dT%H:%M:%SZ')
+        assert response.status_code == 200
+        first_page = response.json()
+        assert len(first_page) == 2
+        next_cursor = response.headers["X-Next-Cursor"]
         
-        response = self.client.get(
-            f"/todos/search?end_date_from={from_date}&end_date_to={to_date}"
-        )
+        response = self.client.get(f"/todos/search?completed=false&limit=2&cursor={next_cursor}")
         
+        assert response.status_code == 200
+        second_page = response.json()
+        assert len(second_page) == 1
+        assert "X-Next-Cursor" not in response.headers
+        assert not {t["id"] for t in first_page} & {t["id"] for t in second_page}
+
+    def test_search_invalid_cursor(self):
+        """無効なカーソル・skipとカーソルの併用でのバリデーションエラーテスト"""
+        response = self.client.get("/todos/search?cursor=invalid")
         assert response.status_code == 422
-        error_detail = response.json()["detail"]
-        assert "end_date_from must be before or equal to end_date_to" in str(error_detail)
-    
-    def test_search_invalid_pagination_params(self):
-        """無効なページネーションパラメータでのバリデーションエラーテスト"""
-        # 負のskip値
-        response = self.client.get("/todos/search?skip=-1")
-        assert response.status_code == 422
-        
-        # 0のlimit値
-        response = self.client.get("/todos/search?limit=0")
+        assert "Invalid cursor" in str(response.json()["detail"])
+
+        cursor = encode_cursor(1, self.anchors.now)
+        response = self.client.get(f"/todos/search?skip=1&cursor={cursor}")
         assert response.status_code == 422
+        assert "skip cannot be combined with cursor" in str(response.json()["detail"])
+
+    @pytest.mark.parametrize(
+        ("query", "expected_message"),
+        [
+            # 無効な日時形式
+            pytest.param("end_date_from=invalid-date", "Input should be a valid datetime", id="invalid_date_format"),
+            # 無効なboolean値
+            pytest.param("completed=invalid-bool", "Input should be a valid boolean", id="invalid_boolean_format"),
+            # end_date_fromがend_date_toより後
+            pytest.param(
+                "end_date_from={now_iso}&end_date_to={yesterday_iso}",
+                "end_date_from must be before or equal to end_date_to",
+                id="invalid_date_range"
+            ),
+            # 負のskip値・0のlimit値・上限を超えるlimit値
+            pytest.param("skip=-1", None, id="negative_skip"),
+            pytest.param("limit=0", None, id="zero_limit"),
+            pytest.param("limit=1001", None, id="limit_too_large"),
+        ]
+    )
+    def test_search_validation_errors(self, query, expected_message):
+        """無効な検索パラメータでのバリデーションエラーテスト"""
+        query = query.format(**self.anchors._asdict())
+        response = self.client.get(f"/todos/search?{query}")
         
-        # 上限を超えるlimit値
-        response = self.client.get("/todos/search?limit=1001")
         assert response.status_code == 422
+        if expected_message is not None:
+            assert expected_message in str(response.json()["detail"])
 
 
 class TestTodoSearchService:
@@ -287,11 +251,10 @@ class TestTodoSearchService:
             Todo(title="Test 3", completed=False, end_date=None)
         ]
         
-        for todo in self.test_todos:
-            self.db.add(todo)
+        self.db.add_all(self.test_todos)
         self.db.commit()
     
-    def test_service_search_todos(self):
+    def test_service_search_todos(self, count_queries):
         """サービス層の検索メソッドテスト"""
         search_params = TodoSearchParams(
             completed=False,
@@ -299,17 +262,36 @@ class TestTodoSearchService:
             limit=10
         )
         
-        todos = self.service.search_todos(search_params)
+        with count_queries() as queries:
+            todos = self.service.search_todos(search_params)
         
+        assert len(queries) == 1  # N+1が発生しないこと
         assert len(todos) == 2
         for todo in todos:
             assert todo.completed is False
     
+    def test_service_search_reuses_compiled_sql(self, test_engine):
+        """同じ条件の組み合わせの検索でコンパイル済みSQLが再利用されることのテスト"""
+        cache_stats = []
+
+        def record_cache_stats(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("SELECT"):
+                cache_stats.append(context.cache_hit)
+
+        event.listen(test_engine, "before_cursor_execute", record_cache_stats)
+        try:
+            # 条件・ページネーションの値だけが異なる検索（値はバインドパラメータになる）
+            for completed, limit in ((True, 10), (False, 5), (True, 1)):
+                self.service.search_todos(TodoSearchParams(completed=completed, limit=limit))
+        finally:
+            event.remove(test_engine, "before_cursor_execute", record_cache_stats)
+
+        # 2回目以降はSQLを再コンパイルせずキャッシュから取得される
+        assert len(cache_stats) == 3
+        assert cache_stats[1:] == [CacheStats.CACHE_HIT, CacheStats.CACHE_HIT]
+    
     def test_service_search_validation_error(self):
         """サービス層のバリデーションエラーテスト"""
-        from app.services.todo import TodoValidationError
-        from pydantic import ValidationError
-        
         # 無効な日時範囲（Pydanticレベルでキャッチされる）
         now = datetime.now(timezone.utc)
         yesterday = now - timedelta(days=1)
@@ -330,7 +312,7 @@ class TestTodoSearchParams:
     
     def test_valid_search_params(self):
         """有効な検索パラメータのテスト"""
-        now = datetime.now(timezone.utc)
+        now = REFERENCE_TIME
         tomorrow = now + timedelta(days=1)
         
         params = TodoSearchParams(
@@ -356,31 +338,35 @@ class TestTodoSearchParams:
         assert params.end_date_to is None
         assert params.skip == 0
         assert params.limit == 100
-    
-    def test_date_range_validation(self):
-        """日時範囲バリデーションのテスト"""
-        now = datetime.now(timezone.utc)
-        yesterday = now - timedelta(days=1)
-        
-        # 無効な範囲（from > to）
-        with pytest.raises(ValueError) as exc_info:
-            TodoSearchParams(
-                end_date_from=now,
-                end_date_to=yesterday
-            )
-        
-        assert "end_date_from must be before or equal to end_date_to" in str(exc_info.value)
-    
-    def test_pagination_validation(self):
-        """ページネーションバリデーションのテスト"""
-        # 負のskip値
-        with pytest.raises(ValueError):
-            TodoSearchParams(skip=-1)
-        
-        # 0のlimit値
-        with pytest.raises(ValueError):
-            TodoSearchParams(limit=0)
-        
-        # 上限を超えるlimit値
-        with pytest.raises(ValueError):
-            TodoSearchParams(limit=1001)
\ No newline at end of file
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [
+            # 無効な範囲（from > to）
+            pytest.param(
+                {"end_date_from": REFERENCE_TIME, "end_date_to": REFERENCE_TIME - timedelta(days=1)},
+                "end_date_from must be before or equal to end_date_to",
+                id="invalid_date_range"
+            ),
+            # 負のskip値・0のlimit値・上限を超えるlimit値
+            pytest.param({"skip": -1}, None, id="negative_skip"),
+            pytest.param({"limit": 0}, None, id="zero_limit"),
+            pytest.param({"limit": 1001}, None, id="limit_too_large"),
+            # デコードできないカーソル・skipとの併用
+            pytest.param({"cursor": "invalid"}, "Invalid cursor", id="invalid_cursor"),
+            pytest.param(
+                {"cursor": encode_cursor(1, REFERENCE_TIME), "skip": 1},
+                "skip cannot be combined with cursor",
+                id="cursor_with_skip"
+            ),
+        ]
+    )
+    def test_invalid_search_params(self, kwargs, match):
+        """無効な検索パラメータでのバリデーションエラーテスト"""
+        with pytest.raises(ValidationError, match=match):
+            TodoSearchParams(**kwargs)
+
+    def test_cursor_validation(self):
+        """有効なカーソルのテスト"""
+        cursor = encode_cursor(1, REFERENCE_TIME)
+        assert TodoSearchParams(cursor=cursor).cursor == cursor
@@ -5,9 +5,11 @@ TodoServiceクラスの単体テストを実装する。
 モックを使用して依存関係をテストする。
 """
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock
+from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
-from datetime import datetime
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
 
 from app.services.todo import (
     TodoService,
@@ -15,200 +17,193 @@ from app.services.todo import (
     TodoValidationError,
     TodoDatabaseError
 )
-from app.schemas.todo import TodoCreate, TodoUpdate, TodoResponse
+from app.repositories.todo import TodoRepository
+from app.schemas.todo import DESCRIPTION_MAX_LENGTH, TITLE_MAX_LENGTH, TodoCreate, TodoUpdate, TodoResponse
 from app.models.todo import Todo
 
+# サンプルの作成・更新日時（値を検証するテストはないため固定値でよい）
+REFERENCE_TIME = datetime(2025, 1, 15, tzinfo=timezone.utc)
 
-class TestTodoService:
-    """TodoServiceクラスのテストケース"""
-    
-    @pytest.fixture
-    def mock_db_session(self):
-        """モックデータベースセッション"""
-        return Mock()
-    
-    @pytest.fixture
-    def mock_repository(self):
-        """モックTodoRepository"""
-        return Mock()
-    
-    @pytest.fixture
-    def todo_service(self, mock_db_session):
-        """TodoServiceインスタンス"""
-        return TodoService(mock_db_session)
-    
-    @pytest.fixture
-    def sample_todo_create(self):
-        """サンプルTodoCreateデータ"""
-        return TodoCreate(
-            title="テストタスク",
-            description="これはテスト用のタスクです",
-            completed=False
-        )
-    
-    @pytest.fixture
-    def sample_todo_update(self):
-        """サンプルTodoUpdateデータ"""
-        return TodoUpdate(
-            title="更新されたタスク",
-            description="更新された説明",
-            completed=True
-        )
-    
-    @pytest.fixture
-    def sample_todo_model(self):
-        """サンプルTodoモデル"""
-        todo = Todo()
-        todo.id = 1
-        todo.title = "テストタスク"
-        todo.description = "これはテスト用のタスクです"
-        todo.completed = False
-        todo.created_at = datetime.now()
-        todo.updated_at = datetime.now()
-        return todo
-
-
-class TestCreateTodo(TestTodoService):
+
+# spec_setを指定して、存在しない属性（メソッド名の誤りなど）の参照・設定をAttributeErrorにする
+# create_autospecはシグネチャまで検証するが、生成に1件あたり数ミリ秒かかるため使わない
+@pytest.fixture
+def mock_db_session():
+    """モックデータベースセッション"""
+    return Mock(spec_set=Session)
+
+
+@pytest.fixture
+def mock_repository():
+    """モックTodoRepository"""
+    return Mock(spec_set=TodoRepository)
+
+
+# conftestの同名フィクスチャ（テスト用DBを使う）を、このモジュールではモックで置き換える
+@pytest.fixture
+def todo_service(mock_db_session, mock_repository):
+    """TodoServiceインスタンス（リポジトリはmock_repositoryに差し替え済み）"""
+    service = TodoService(mock_db_session)
+    service.repository = mock_repository
+    return service
+
+
+@pytest.fixture(scope="module")
+def sample_todo_create():
+    """サンプルTodoCreateデータ（テストでは参照のみのため、モジュール内で共有する）"""
+    return TodoCreate(
+        title="テストタスク",
+        description="これはテスト用のタスクです",
+        completed=False
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_todo_update():
+    """サンプルTodoUpdateデータ（テストでは参照のみのため、モジュール内で共有する）"""
+    return TodoUpdate(
+        title="更新されたタスク",
+        description="更新された説明",
+        completed=True
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_todo_model():
+    """サンプルTodoモデル（テストでは参照のみのため、モジュール内で共有する）"""
+    return Todo(
+        id=1,
+        title="テストタスク",
+        description="これはテスト用のタスクです",
+        completed=False,
+        created_at=REFERENCE_TIME,
+        updated_at=REFERENCE_TIME
+    )
+
+
+def _assert_sample_response(result) -> None:
+    """sample_todo_modelから変換されたTodoResponseであることを検証する"""
+    # 変換結果の型はサブクラスではなくTodoResponseそのもの
+    assert type(result) is TodoResponse
+    assert result.id == 1
+    assert result.title == "テストタスク"
+    assert result.description == "これはテスト用のタスクです"
+    assert result.completed is False
+    assert result.created_at == REFERENCE_TIME
+    assert result.updated_at == REFERENCE_TIME
+
+
+class TestCreateTodo:
     """create_todoメソッドのテスト"""
     
     def test_create_todo_success(self, todo_service, mock_repository, sample_todo_create, sample_todo_model):
         """正常なToDoアイテム作成のテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
         mock_repository.create.return_value = sample_todo_model
         
         # テスト実行
         result = todo_service.create_todo(sample_todo_create)
         
         # 検証
-        assert isinstance(result, TodoResponse)
-        assert result.id == 1
-        assert result.title == "テストタスク"
-        assert result.description == "これはテスト用のタスクです"
-        assert result.completed is False
+        _assert_sample_response(result)
         mock_repository.create.assert_called_once_with(sample_todo_create)
     
-    def test_create_todo_empty_title(self, todo_service):
-        """空のタイトルでのToDoアイテム作成エラーのテスト"""
-        # Pydanticレベルでバリデーションエラーが発生することを確認
-        from pydantic import ValidationError
-        
-        with pytest.raises(ValidationError) as exc_info:
-            TodoCreate(title="", description="説明", completed=False)
-        
-        assert "String should have at least 1 character" in str(exc_info.value)
-    
-    def test_create_todo_whitespace_only_title(self, todo_service):
-        """空白のみのタイトルでのToDoアイテム作成エラーのテスト"""
-        # Pydanticレベルでバリデーションエラーが発生することを確認
-        from pydantic import ValidationError
-        
-        with pytest.raises(ValidationError) as exc_info:
-            TodoCreate(title="   ", description="説明", completed=False)
-        
-        assert "Title cannot be empty" in str(exc_info.value)
-    
-    def test_create_todo_title_too_long(self, todo_service):
-        """長すぎるタイトルでのToDoアイテム作成エラーのテスト"""
-        # Pydanticレベルでバリデーションエラーが発生することを確認
-        from pydantic import ValidationError
-        
-        long_title = "a" * 201
-        with pytest.raises(ValidationError) as exc_info:
-            TodoCreate(title=long_title, description="説明", completed=False)
-        
-        assert "String should have at most 200 characters" in str(exc_info.value)
-    
-    def test_create_todo_description_too_long(self, todo_service):
-        """長すぎる説明でのToDoアイテム作成エラーのテスト"""
-        # Pydanticレベルでバリデーションエラーが発生することを確認
-        from pydantic import ValidationError
-        
-        long_description = "a" * 1001
-        with pytest.raises(ValidationError) as exc_info:
-            TodoCreate(title="タイトル", description=long_description, completed=False)
-        
-        assert "String should have at most 1000 characters" in str(exc_info.value)
-    
-    def test_create_todo_service_level_validation(self, todo_service, mock_repository):
-        """サービスレベルでのバリデーションテスト（空白のみのタイトル）"""
+    @pytest.mark.parametrize(
+        ("title", "description", "expected_message"),
+        [
+            pytest.param("", "説明", "String should have at least 1 character", id="empty_title"),
+            # 前後の空白を除去した後の最小長チェックで拒否される
+            pytest.param("   ", "説明", "String should have at least 1 character", id="whitespace_only_title"),
+            pytest.param(
+                "a" * (TITLE_MAX_LENGTH + 1), "説明",
+                f"String should have at most {TITLE_MAX_LENGTH} characters",
+                id="title_too_long"
+            ),
+            pytest.param(
+                "タイトル", "a" * (DESCRIPTION_MAX_LENGTH + 1),
+                f"String should have at most {DESCRIPTION_MAX_LENGTH} characters",
+                id="description_too_long"
+            ),
+        ]
+    )
+    def test_create_todo_validation_errors(self, title, description, expected_message):
+        """無効なタイトル・説明でのToDoアイテム作成エラーのテスト"""
         # Pydanticレベルでバリデーションエラーが発生することを確認
-        from pydantic import ValidationError
-        
-        # 空白のみのタイトルでPydanticレベルのバリデーションをテスト
-        with pytest.raises(ValidationError) as exc_info:
-            TodoCreate(title="   ", description="説明", completed=False)
-        
-        assert "Title cannot be empty" in str(exc_info.value)
-    
-    def test_create_todo_database_error(self, todo_service, mock_repository, sample_todo_create):
-        """データベースエラーでのToDoアイテム作成エラーのテスト"""
-        # モックの設定
-        todo_service.repository = mock_repository
-        mock_repository.create.side_effect = SQLAlchemyError("Database error")
-        
-        with pytest.raises(TodoDatabaseError) as exc_info:
-            todo_service.create_todo(sample_todo_create)
-        
-        assert "Failed to create todo item" in str(exc_info.value)
+        with pytest.raises(ValidationError, match=expected_message):
+            TodoCreate(title=title, description=description, completed=False)
 
 
-class TestGetTodoById(TestTodoService):
+class TestGetTodoById:
     """get_todo_by_idメソッドのテスト"""
     
     def test_get_todo_by_id_success(self, todo_service, mock_repository, sample_todo_model):
         """正常なToDoアイテム取得のテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
         mock_repository.get_by_id.return_value = sample_todo_model
         
         # テスト実行
         result = todo_service.get_todo_by_id(1)
         
         # 検証
-        assert isinstance(result, TodoResponse)
-        assert result.id == 1
-        assert result.title == "テストタスク"
+        _assert_sample_response(result)
         mock_repository.get_by_id.assert_called_once_with(1)
     
-    def test_get_todo_by_id_not_found(self, todo_service, mock_repository):
-        """存在しないToDoアイテム取得のテスト"""
+    def test_get_todo_by_id_uses_cache(self, todo_service, mock_repository, sample_todo_model):
+        """2回目以降の取得がキャッシュから返されることのテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
-        mock_repository.get_by_id.return_value = None
-        
-        with pytest.raises(TodoNotFoundError) as exc_info:
-            todo_service.get_todo_by_id(999)
-        
-        assert exc_info.value.todo_id == 999
-        assert "Todo item with id 999 not found" in str(exc_info.value)
-    
-    def test_get_todo_by_id_invalid_id(self, todo_service):
-        """無効なIDでのToDoアイテム取得エラーのテスト"""
-        with pytest.raises(TodoValidationError) as exc_info:
-            todo_service.get_todo_by_id(-1)
-        
-        assert "Todo ID must be a positive integer" in str(exc_info.value)
-    
-    def test_get_todo_by_id_database_error(self, todo_service, mock_repository):
-        """データベースエラーでのToDoアイテム取得エラーのテスト"""
+        mock_repository.get_by_id.return_value = sample_todo_model
+
+        # テスト実行
+        first = todo_service.get_todo_by_id(1)
+        second = todo_service.get_todo_by_id(1)
+
+        # 検証
+        assert first == second
+        mock_repository.get_by_id.assert_called_once_with(1)
+
+    def test_update_todo_invalidates_cache(self, todo_service, mock_repository, sample_todo_update, sample_todo_model):
+        """更新時にキャッシュが無効化されることのテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
-        mock_repository.get_by_id.side_effect = SQLAlchemyError("Database error")
-        
-        with pytest.raises(TodoDatabaseError) as exc_info:
-            todo_service.get_todo_by_id(1)
-        
-        assert "Failed to retrieve todo item 1" in str(exc_info.value)
+        mock_repository.get_by_id.return_value = sample_todo_model
+        mock_repository.update.return_value = sample_todo_model
+        todo_service.get_todo_by_id(1)
 
+        # テスト実行
+        todo_service.update_todo(1, sample_todo_update)
+        todo_service.get_todo_by_id(1)
+
+        # 検証（初回取得 + キャッシュ無効化後の再取得）
+        assert mock_repository.get_by_id.call_count == 2
+
+    def test_update_during_read_does_not_cache_stale_todo(
+        self, todo_service, mock_repository, sample_todo_update, sample_todo_model
+    ):
+        """読み取り中に更新された場合、読み取った古い行がキャッシュされないことのテスト"""
+        # モックの設定（リクエストAのDB読み取り後、結果を返す前にリクエストBの更新が完了する）
+        mock_repository.update.return_value = sample_todo_model
 
-class TestGetAllTodos(TestTodoService):
+        def read_then_concurrent_update(todo_id):
+            todo_service.update_todo(todo_id, sample_todo_update)
+            return sample_todo_model
+
+        mock_repository.get_by_id.side_effect = read_then_concurrent_update
+        todo_service.get_todo_by_id(1)
+
+        # テスト実行
+        mock_repository.get_by_id.side_effect = None
+        mock_repository.get_by_id.return_value = sample_todo_model
+        todo_service.get_todo_by_id(1)
+
+        # 検証（古い行はキャッシュされず、2回目もDBから取得される）
+        assert mock_repository.get_by_id.call_count == 2
+
+
+class TestGetAllTodos:
     """get_all_todosメソッドのテスト"""
     
     def test_get_all_todos_success(self, todo_service, mock_repository, sample_todo_model):
         """正常な全ToDoアイテム取得のテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
         mock_repository.get_all.return_value = [sample_todo_model]
         
         # テスト実行
@@ -217,14 +212,12 @@ class TestGetAllTodos(TestTodoService):
         # 検証
         assert isinstance(result, list)
         assert len(result) == 1
-        assert isinstance(result[0], TodoResponse)
-        assert result[0].id == 1
+        _assert_sample_response(result[0])
         mock_repository.get_all.assert_called_once_with(0, 100)
     
     def test_get_all_todos_with_pagination(self, todo_service, mock_repository):
         """ページネーション付き全ToDoアイテム取得のテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
         mock_repository.get_all.return_value = []
         
         # テスト実行
@@ -237,84 +230,112 @@ class TestGetAllTodos(TestTodoService):
     
     def test_get_all_todos_invalid_skip(self, todo_service):
         """無効なskipパラメータでのエラーのテスト"""
-        with pytest.raises(TodoValidationError) as exc_info:
+        with pytest.raises(TodoValidationError, match="Skip parameter must be a non-negative integer"):
             todo_service.get_all_todos(skip=-1)
-        
-        assert "Skip parameter must be a non-negative integer" in str(exc_info.value)
     
     def test_get_all_todos_invalid_limit(self, todo_service):
         """無効なlimitパラメータでのエラーのテスト"""
-        with pytest.raises(TodoValidationError) as exc_info:
+        with pytest.raises(TodoValidationError, match="Limit parameter must be a positive integer"):
             todo_service.get_all_todos(limit=0)
-        
-        assert "Limit parameter must be a positive integer" in str(exc_info.value)
     
     def test_get_all_todos_limit_too_large(self, todo_service):
         """大きすぎるlimitパラメータでのエラーのテスト"""
-        with pytest.raises(TodoValidationError) as exc_info:
+        with pytest.raises(TodoValidationError, match="Limit parameter cannot exceed 1000"):
             todo_service.get_all_todos(limit=1001)
-        
-        assert "Limit parameter cannot exceed 1000" in str(exc_info.value)
 
+    def test_get_todos_page_uses_estimated_total(self, todo_service, mock_repository, sample_todo_model):
+        """概算件数が得られる場合はCOUNTを発行しないことのテスト"""
+        # モックの設定
+        mock_repository.estimate_count_all.return_value = 500
+        mock_repository.get_all.return_value = [sample_todo_model]
+
+        # テスト実行
+        result, total, has_more = todo_service.get_todos_page(skip=0, limit=10)
+
+        # 検証
+        assert len(result) == 1
+        assert total == 500
+        assert has_more is False
+        # 次ページの有無を判定するため1件多く取得する
+        mock_repository.get_all.assert_called_once_with(0, 11)
+        mock_repository.get_page.assert_not_called()
+
+    def test_get_todos_page_has_more_with_stale_estimate(self, todo_service, mock_repository, sample_todo_model):
+        """概算件数が実際より少なくても、取得した行から次ページの有無を判定することのテスト"""
+        # モックの設定（概算は1件だが、limit+1件の行が存在する）
+        mock_repository.estimate_count_all.return_value = 1
+        mock_repository.get_all.return_value = [sample_todo_model, sample_todo_model, sample_todo_model]
+
+        # テスト実行
+        result, total, has_more = todo_service.get_todos_page(skip=0, limit=2)
+
+        # 検証
+        assert len(result) == 2
+        assert has_more is True
+        assert total == 3
+
+    def test_get_todos_page_exact_total(self, todo_service, mock_repository, sample_todo_model):
+        """exact_total指定時は正確な件数を取得することのテスト"""
+        # モックの設定
+        mock_repository.get_page.return_value = ([sample_todo_model], 1)
+
+        # テスト実行
+        result, total, has_more = todo_service.get_todos_page(skip=0, limit=10, exact_total=True)
 
-class TestUpdateTodo(TestTodoService):
+        # 検証
+        assert total == 1
+        assert has_more is False
+        mock_repository.estimate_count_all.assert_not_called()
+        mock_repository.get_page.assert_called_once_with(0, 11)
+
+
+class TestUpdateTodo:
     """update_todoメソッドのテスト"""
     
     def test_update_todo_success(self, todo_service, mock_repository, sample_todo_update, sample_todo_model):
         """正常なToDoアイテム更新のテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
-        mock_repository.get_by_id.return_value = sample_todo_model
         mock_repository.update.return_value = sample_todo_model
         
         # テスト実行
         result = todo_service.update_todo(1, sample_todo_update)
         
         # 検証
-        assert isinstance(result, TodoResponse)
-        assert result.id == 1
-        mock_repository.get_by_id.assert_called_once_with(1)
+        _assert_sample_response(result)
+        # 存在確認のための事前取得は行わない
+        mock_repository.get_by_id.assert_not_called()
         mock_repository.update.assert_called_once_with(1, sample_todo_update)
     
-    def test_update_todo_not_found(self, todo_service, mock_repository, sample_todo_update):
-        """存在しないToDoアイテム更新のテスト"""
-        # モックの設定
-        todo_service.repository = mock_repository
-        mock_repository.get_by_id.return_value = None
-        
-        with pytest.raises(TodoNotFoundError) as exc_info:
-            todo_service.update_todo(999, sample_todo_update)
-        
-        assert exc_info.value.todo_id == 999
-    
     def test_update_todo_empty_update(self, todo_service):
         """空の更新データでのエラーのテスト"""
         empty_update = TodoUpdate()
         
-        with pytest.raises(TodoValidationError) as exc_info:
+        with pytest.raises(TodoValidationError, match="At least one field must be provided for update"):
             todo_service.update_todo(1, empty_update)
-        
-        assert "At least one field must be provided for update" in str(exc_info.value)
     
     def test_update_todo_invalid_title(self, todo_service):
         """無効なタイトルでの更新エラーのテスト"""
         # Pydanticレベルでバリデーションエラーが発生することを確認
-        from pydantic import ValidationError
-        
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match="String should have at least 1 character"):
             TodoUpdate(title="")
-        
-        assert "String should have at least 1 character" in str(exc_info.value)
 
+    def test_update_todo_strips_whitespace(self):
+        """更新データのタイトル・説明の前後空白が除去されることのテスト"""
+        update = TodoUpdate(title="  更新タイトル  ", description="   ")
+
+        assert update.title == "更新タイトル"
+        assert update.description is None
+
+        with pytest.raises(ValidationError):
+            TodoUpdate(title="   ")
 
-class TestDeleteTodo(TestTodoService):
+
+class TestDeleteTodo:
     """delete_todoメソッドのテスト"""
     
     def test_delete_todo_success(self, todo_service, mock_repository, sample_todo_model):
         """正常なToDoアイテム削除のテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
-        mock_repository.get_by_id.return_value = sample_todo_model
         mock_repository.delete.return_value = True
         
         # テスト実行
@@ -322,28 +343,64 @@ class TestDeleteTodo(TestTodoService):
         
         # 検証
         assert result is True
-        mock_repository.get_by_id.assert_called_once_with(1)
+        mock_repository.get_by_id.assert_not_called()
         mock_repository.delete.assert_called_once_with(1)
+
+
+class TestErrorPaths:
+    """存在しないID・データベースエラー時の例外のテスト"""
+    
+    @pytest.mark.parametrize(
+        ("method", "repository_method", "missing_result", "args"),
+        [
+            pytest.param("get_todo_by_id", "get_by_id", None, (999,), id="get"),
+            pytest.param("update_todo", "update", None, (999, TodoUpdate(title="更新されたタスク")), id="update"),
+            pytest.param("delete_todo", "delete", False, (999,), id="delete"),
+        ]
+    )
+    def test_not_found(self, todo_service, mock_repository, method, repository_method, missing_result, args):
+        """存在しないToDoアイテムの操作でTodoNotFoundErrorが発生することのテスト"""
+        # モックの設定（対象が存在しない場合のリポジトリの戻り値）
+        getattr(mock_repository, repository_method).return_value = missing_result
+        
+        with pytest.raises(TodoNotFoundError, match="Todo item with id 999 not found") as exc_info:
+            getattr(todo_service, method)(*args)
+        
+        assert exc_info.value.todo_id == 999
     
-    def test_delete_todo_not_found(self, todo_service, mock_repository):
-        """存在しないToDoアイテム削除のテスト"""
+    @pytest.mark.parametrize(
+        ("method", "repository_method", "args", "expected_message"),
+        [
+            pytest.param(
+                "create_todo", "create", (TodoCreate(title="テストタスク"),),
+                "Failed to create todo item", id="create"
+            ),
+            pytest.param("get_todo_by_id", "get_by_id", (1,), "Failed to retrieve todo item 1", id="get"),
+            pytest.param(
+                "update_todo", "update", (1, TodoUpdate(title="更新されたタスク")),
+                "Failed to update todo item 1", id="update"
+            ),
+            pytest.param("delete_todo", "delete", (1,), "Failed to delete todo item 1", id="delete"),
+        ]
+    )
+    def test_database_error(self, todo_service, mock_repository, method, repository_method, args, expected_message):
+        """データベースエラーがTodoDatabaseErrorに変換されることのテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
-        mock_repository.get_by_id.return_value = None
+        error = SQLAlchemyError("Database error")
+        getattr(mock_repository, repository_method).side_effect = error
         
-        with pytest.raises(TodoNotFoundError) as exc_info:
-            todo_service.delete_todo(999)
+        with pytest.raises(TodoDatabaseError, match=expected_message) as exc_info:
+            getattr(todo_service, method)(*args)
         
-        assert exc_info.value.todo_id == 999
+        assert exc_info.value.original_error is error
 
 
-class TestGetTodosByStatus(TestTodoService):
+class TestGetTodosByStatus:
     """get_todos_by_statusメソッドのテスト"""
     
     def test_get_todos_by_status_completed(self, todo_service, mock_repository, sample_todo_model):
         """完了済みToDoアイテム取得のテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
         mock_repository.get_by_completion_status.return_value = [sample_todo_model]
         
         # テスト実行
@@ -352,13 +409,12 @@ class TestGetTodosByStatus(TestTodoService):
         # 検証
         assert isinstance(result, list)
         assert len(result) == 1
-        assert isinstance(result[0], TodoResponse)
-        mock_repository.get_by_completion_status.assert_called_once_with(True)
+        _assert_sample_response(result[0])
+        mock_repository.get_by_completion_status.assert_called_once_with(True, 0, 100)
     
     def test_get_todos_by_status_pending(self, todo_service, mock_repository):
         """未完了ToDoアイテム取得のテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
         mock_repository.get_by_completion_status.return_value = []
         
         # テスト実行
@@ -367,18 +423,16 @@ class TestGetTodosByStatus(TestTodoService):
         # 検証
         assert isinstance(result, list)
         assert len(result) == 0
-        mock_repository.get_by_completion_status.assert_called_once_with(False)
+        mock_repository.get_by_completion_status.assert_called_once_with(False, 0, 100)
 
 
-class TestGetTodoStatistics(TestTodoService):
+class TestGetTodoStatistics:
     """get_todo_statisticsメソッドのテスト"""
     
     def test_get_todo_statistics_success(self, todo_service, mock_repository):
         """正常な統計情報取得のテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
-        mock_repository.count_all.return_value = 10
-        mock_repository.count_by_completion_status.side_effect = [3, 7]  # completed=True, completed=False
+        mock_repository.get_stats.return_value = (10, 3)  # 総数, 完了済み
         
         # テスト実行
         result = todo_service.get_todo_statistics()
@@ -390,15 +444,12 @@ class TestGetTodoStatistics(TestTodoService):
         assert result["pending"] == 7
         assert result["completion_rate"] == 30.0
         
-        mock_repository.count_all.assert_called_once()
-        assert mock_repository.count_by_completion_status.call_count == 2
+        mock_repository.get_stats.assert_called_once()
     
     def test_get_todo_statistics_empty(self, todo_service, mock_repository):
         """空の統計情報取得のテスト"""
         # モックの設定
-        todo_service.repository = mock_repository
-        mock_repository.count_all.return_value = 0
-        mock_repository.count_by_completion_status.side_effect = [0, 0]
+        mock_repository.get_stats.return_value = (0, 0)
         
         # テスト実行
         result = todo_service.get_todo_statistics()
@@ -411,36 +462,24 @@ class TestGetTodoStatistics(TestTodoService):
         assert result["completion_rate"] == 0.0
 
 
-class TestValidationMethods(TestTodoService):
+class TestValidationMethods:
     """バリデーションメソッドのテスト"""
     
-    def test_validate_todo_id_valid(self, todo_service):
-        """有効なTodoIDのバリデーションテスト"""
-        # 例外が発生しないことを確認
-        todo_service._validate_todo_id(1)
-        todo_service._validate_todo_id(999)
-    
-    def test_validate_todo_id_invalid(self, todo_service):
-        """無効なTodoIDのバリデーションテスト"""
-        with pytest.raises(TodoValidationError):
-            todo_service._validate_todo_id(0)
-        
-        with pytest.raises(TodoValidationError):
-            todo_service._validate_todo_id(-1)
-    
     def test_validate_pagination_params_valid(self, todo_service):
         """有効なページネーションパラメータのバリデーションテスト"""
-        # 例外が発生しないことを確認
-        todo_service._validate_pagination_params(0, 10)
-        todo_service._validate_pagination_params(100, 1000)
-    
-    def test_validate_pagination_params_invalid(self, todo_service):
+        # 例外が発生しないことを確認（境界値を含む）
+        for skip, limit in ((0, 10), (100, 1000), (0, 1), (0, 1000)):
+            todo_service._validate_pagination_params(skip, limit)
+    
+    @pytest.mark.parametrize(
+        ("skip", "limit", "expected_message"),
+        [
+            pytest.param(-1, 10, "Skip parameter must be a non-negative integer", id="negative_skip"),
+            pytest.param(0, 0, "Limit parameter must be a positive integer", id="zero_limit"),
+            pytest.param(0, 1001, "Limit parameter cannot exceed 1000", id="limit_too_large"),
+        ]
+    )
+    def test_validate_pagination_params_invalid(self, todo_service, skip, limit, expected_message):
         """無効なページネーションパラメータのバリデーションテスト"""
-        with pytest.raises(TodoValidationError):
-            todo_service._validate_pagination_params(-1, 10)
-        
-        with pytest.raises(TodoValidationError):
-            todo_service._validate_pagination_params(0, 0)
-        
-        with pytest.raises(TodoValidationError):
-            todo_service._validate_pagination_params(0, 1001)
\ No newline at end of file
+        with pytest.raises(TodoValidationError, match=expected_message):
+            todo_service._validate_pagination_params(skip, limit)